@@ -1,34 +1,109 @@
+import atexit
+import json
 import logging
+import logging.handlers
+import os
+import queue
+import random
 import sys
+from contextvars import ContextVar
 from pathlib import Path
 
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text").lower()
+LOG_DIR = os.getenv("LOG_DIR", "logs")
+LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", "5"))
+LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", "1.0"))
+
+# Pass as `extra=SAMPLED` on high-volume per-request lines to keep only LOG_SAMPLE_RATE of them.
+SAMPLED = {"sampled": True}
+
+request_id_var: ContextVar[str] = ContextVar("request_id", default="-")
+
+_listener: logging.handlers.QueueListener | None = None
+
+
+class RequestContextFilter(logging.Filter):
+    """Attach the current request ID to every record and sample the records marked as sampled."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        if getattr(record, "sampled", False) and LOG_SAMPLE_RATE < 1.0:
+            return random.random() < LOG_SAMPLE_RATE
+        return True
+
+
+class JSONFormatter(logging.Formatter):
+    """Format records as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", "-"),
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
 def setup_logging():
-    """Configure logging for the application"""
-    log_format = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-    log_dir = Path("logs")
+    """
+    Configure logging for the application.
+
+    Records are put on an in-memory queue by the calling thread and written to
+    stdout and a size-rotated file by a background QueueListener, so logging
+    never blocks the event loop on I/O.
+    """
+    global _listener
+    if _listener is not None:
+        return
+    if LOG_FORMAT == "json":
+        formatter = JSONFormatter()
+    else:
+        formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s")
+    log_dir = Path(LOG_DIR)
     log_dir.mkdir(exist_ok=True)
-    logging.basicConfig(
-        level=logging.INFO,
-        format=log_format,
-        handlers=[
-            logging.FileHandler(log_dir / "app.log"),
-            logging.StreamHandler(sys.stdout)
-        ]
+    file_handler = logging.handlers.RotatingFileHandler(
+        log_dir / "app.log", maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT
     )
+    stream_handler = logging.StreamHandler(sys.stdout)
+    for handler in (file_handler, stream_handler):
+        handler.setFormatter(formatter)
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.addFilter(RequestContextFilter())
+    root = logging.getLogger()
+    root.setLevel(LOG_LEVEL)
+    root.handlers = [queue_handler]
+    _listener = logging.handlers.QueueListener(log_queue, file_handler, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging():
+    """Flush the queued records and stop the background listener."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
 
 logger = logging.getLogger(__name__)
 
-def debug(msg):
-    logger.debug(msg)
+def debug(msg, *args):
+    logger.debug(msg, *args)
 
-def info(msg):
-    logger.info(msg)
+def info(msg, *args):
+    logger.info(msg, *args)
 
-def warning(msg):
-    logger.warning(msg)
+def warning(msg, *args):
+    logger.warning(msg, *args)
 
-def error(msg):
-    logger.error(msg)
+def error(msg, *args):
+    logger.error(msg, *args)
 
-def critical(msg):
-    logger.critical(msg)
\ No newline at end of file
+def critical(msg, *args):
+    logger.critical(msg, *args)
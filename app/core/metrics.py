@@ -0,0 +1,86 @@
+import os
+import time
+from contextlib import contextmanager
+from collections.abc import Iterator
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Histogram, REGISTRY, generate_latest
+from prometheus_client import multiprocess
+
+_LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 40, 80)
+
+STAGE_LATENCY = Histogram(
+    "stage_duration_seconds",
+    "Time spent in each processing stage",
+    ["stage"],
+    buckets=_LATENCY_BUCKETS,
+)
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "End-to-end latency per endpoint",
+    ["method", "endpoint", "status"],
+    buckets=_LATENCY_BUCKETS,
+)
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Cache lookups per kind, tier and result (hit or miss)",
+    ["kind", "tier", "result"],
+)
+UPSTREAM_ERRORS = Counter(
+    "upstream_errors_total",
+    "Failed upstream calls by upstream and status",
+    ["upstream", "status"],
+)
+OPENAI_TOKENS = Counter(
+    "openai_tokens_total",
+    "OpenAI tokens reported in response.usage",
+    ["type"],
+)
+TRANSCRIPT_TOKENS = Counter(
+    "transcript_tokens_total",
+    "Transcript tokens before and after preprocessing, per request",
+    ["stage"],
+)
+
+METRICS_CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+
+@contextmanager
+def time_stage(stage: str) -> Iterator[None]:
+    """Record the duration of the wrapped block in the stage latency histogram."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_LATENCY.labels(stage).observe(time.perf_counter() - start)
+
+
+def record_cache_lookup(kind: str, tier: str, hit: bool) -> None:
+    """Count one cache lookup."""
+    CACHE_REQUESTS.labels(kind, tier, "hit" if hit else "miss").inc()
+
+
+def record_upstream_error(upstream: str, status: int | str) -> None:
+    """Count one failed upstream call."""
+    UPSTREAM_ERRORS.labels(upstream, str(status)).inc()
+
+
+def record_openai_usage(usage) -> None:
+    """Count the tokens of an OpenAI response, if it reports usage."""
+    if usage is None:
+        return
+    OPENAI_TOKENS.labels("input").inc(getattr(usage, "input_tokens", 0) or 0)
+    OPENAI_TOKENS.labels("output").inc(getattr(usage, "output_tokens", 0) or 0)
+
+
+def record_transcript_tokens(original: int, preprocessed: int) -> None:
+    """Count the tokens of a transcript before and after preprocessing."""
+    TRANSCRIPT_TOKENS.labels("original").inc(original)
+    TRANSCRIPT_TOKENS.labels("preprocessed").inc(preprocessed)
+
+
+def render_metrics() -> bytes:
+    """Render the metrics in the Prometheus text format, merging all workers in multiprocess mode."""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
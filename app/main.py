@@ -1,16 +1,67 @@
-from dotenv import load_dotenv
-load_dotenv()
+import time
+import uuid
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from app.routers.summary import router as summary_router
 from app.routers.quiz import router as quiz_router
-from app.core.logging import setup_logging, info
+from app.routers.learning_pack import router as learning_pack_router
+from app.routers.batch import router as batch_router
+from app.routers.jobs import router as jobs_router
+from app.routers.stats import router as stats_router
+from app.routers.health import router as health_router
+from app.core.logging import setup_logging, info, request_id_var
+from app.core.metrics import REQUEST_LATENCY, METRICS_CONTENT_TYPE, render_metrics
+from app.services.cache import start_cache_invalidation_listener, stop_cache_invalidation_listener
+from app.services.http_client import get_transcript_http_client, close_http_clients
+from app.services.openai import close_openai_client
+from app.services.redis_client import get_redis_client, close_redis_client
 from app.utils.exceptions import APIException
 
-setup_logging()
-info("Logging initialized successfully.")
 
-app = FastAPI(title="YouTube AI Learning API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Set up logging and the shared clients on startup and release them on shutdown.
+
+    Nothing here connects eagerly: the clients open connections on first use, so a
+    worker starts even if Redis is still coming up and reports it on /health/ready.
+    """
+    start = time.perf_counter()
+    setup_logging()
+    info("Logging initialized successfully.")
+    get_redis_client()
+    get_transcript_http_client()
+    start_cache_invalidation_listener()
+    info("Startup completed in %.1f ms.", (time.perf_counter() - start) * 1000)
+    yield
+    await stop_cache_invalidation_listener()
+    await close_http_clients()
+    await close_openai_client()
+    await close_redis_client()
+    info("HTTP client pools closed.")
+
+
+app = FastAPI(title="YouTube AI Learning API", lifespan=lifespan)
+
+
+@app.middleware("http")
+async def request_id_middleware(request: Request, call_next):
+    """Tag the logs of each request with its X-Request-ID (generated if absent) and time it per endpoint."""
+    request_id = request.headers.get("X-Request-ID") or uuid.uuid4().hex
+    token = request_id_var.set(request_id)
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+    finally:
+        request_id_var.reset(token)
+        route = request.scope.get("route")
+        endpoint = route.path if route is not None else "unmatched"
+        REQUEST_LATENCY.labels(request.method, endpoint, str(status)).observe(time.perf_counter() - start)
+    response.headers["X-Request-ID"] = request_id
+    return response
 
 
 @app.exception_handler(APIException)
@@ -18,11 +69,23 @@ async def api_exception_handler(request: Request, exc: APIException):
     return JSONResponse(
         status_code=exc.status_code,
         content={"detail": exc.detail},
+        headers=exc.headers,
     )
 
 
 app.include_router(summary_router)
 app.include_router(quiz_router)
+app.include_router(learning_pack_router)
+app.include_router(batch_router)
+app.include_router(jobs_router)
+app.include_router(stats_router)
+app.include_router(health_router)
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus scrape endpoint."""
+    return Response(render_metrics(), media_type=METRICS_CONTENT_TYPE)
 
 
 @app.get("/")
@@ -0,0 +1,45 @@
+import json
+import logging
+from collections.abc import AsyncIterator
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from app.schemas.batch import BatchRequest
+from app.services.batch import run_batch
+from app.security.auth import validate_api_key
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix="/batch",
+    tags=["Batch"],
+    dependencies=[Depends(validate_api_key)]
+)
+
+
+async def batch_ndjson_stream(request: BatchRequest) -> AsyncIterator[str]:
+    """Serialize batch results as newline-delimited JSON."""
+    async for result in run_batch(request):
+        yield json.dumps(result, ensure_ascii=False) + "\n"
+
+
+@router.post(
+    "/",
+    summary="Generate summaries and/or quizzes for many YouTube videos",
+    description=(
+        "Deduplicates the videos by ID and streams one NDJSON line per unique video as soon as it is ready. "
+        "Each line has `video_id`, the `youtube_urls` that resolved to it, and `summary` and/or `quiz`, "
+        "or an `error` object if that video failed."
+    ),
+    response_class=StreamingResponse,
+    responses={
+        200: {"description": "Per-video results", "content": {"application/x-ndjson": {}}},
+        422: {"description": "Invalid request body"},
+    }
+)
+async def generate_batch(request: BatchRequest):
+    """Endpoint to process a batch of YouTube videos."""
+    logger.info(
+        "Batch request: %s URLs, Mode=%s, Language=%s, Questions=%s",
+        len(request.youtube_urls), request.mode, request.language, request.num_questions
+    )
+    return StreamingResponse(batch_ndjson_stream(request), media_type="application/x-ndjson")
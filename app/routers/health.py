@@ -0,0 +1,34 @@
+import asyncio
+import os
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from app.services.redis_client import get_redis_client
+
+HEALTH_CHECK_TIMEOUT = float(os.getenv("HEALTH_CHECK_TIMEOUT", "1"))
+
+router = APIRouter(
+    prefix="/health",
+    tags=["Health"],
+)
+
+@router.get(
+    "/live",
+    summary="Liveness probe",
+    description="Returns 200 while the process is up and serving requests. Does not touch any dependency.",
+)
+async def live():
+    """Endpoint for liveness probes."""
+    return {"status": "ok"}
+
+@router.get(
+    "/ready",
+    summary="Readiness probe",
+    description="Returns 200 when Redis answers a PING within HEALTH_CHECK_TIMEOUT seconds, and 503 otherwise.",
+)
+async def ready():
+    """Endpoint for readiness probes."""
+    try:
+        await asyncio.wait_for(get_redis_client().ping(), HEALTH_CHECK_TIMEOUT)
+    except Exception as e:
+        return JSONResponse(status_code=503, content={"status": "unavailable", "redis": str(e) or type(e).__name__})
+    return {"status": "ready", "redis": "ok"}
@@ -0,0 +1,57 @@
+import logging
+from fastapi import APIRouter, Depends, Path, status
+from app.core.logging import SAMPLED
+from app.schemas.jobs import JobRequest, JobStatus
+from app.services.jobs import submit_job, get_job
+from app.security.auth import validate_api_key
+from app.utils.exceptions import APIException
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix="/jobs",
+    tags=["Jobs"],
+    dependencies=[Depends(validate_api_key)]
+)
+
+@router.post(
+    "/",
+    response_model=JobStatus,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Queue a summary or quiz generation",
+    description=(
+        "Queues the generation and returns immediately with a job ID. Poll `/jobs/{job_id}` for the result, "
+        "or pass `webhook_url` to receive the finished job as a POST. Cached results complete the job right away."
+    ),
+    responses={
+        202: {"description": "Job accepted"},
+        400: {"description": "Invalid input parameters (invalid URL, language, or number of questions)"},
+        422: {"description": "Invalid YouTube URL or validation error"},
+    }
+)
+async def create_job(request: JobRequest):
+    """Endpoint to queue an asynchronous generation job."""
+    logger.info(
+        "Job request: Kind=%s, URL=%s, Language=%s",
+        request.kind, request.youtube_url, request.language,
+        extra=SAMPLED
+    )
+    return await submit_job(request)
+
+
+@router.get(
+    "/{job_id}",
+    response_model=JobStatus,
+    summary="Get the status of a generation job",
+    description="Returns the job status, and its result or error once it has finished.",
+    responses={
+        200: {"description": "Job found"},
+        404: {"description": "Unknown or expired job"},
+    }
+)
+async def read_job(job_id: str = Path(..., description="Job ID returned when the job was queued")):
+    """Endpoint to poll a generation job."""
+    job = await get_job(job_id)
+    if job is None:
+        raise APIException(status_code=404, detail="Job not found")
+    return job
@@ -0,0 +1,77 @@
+import logging
+from fastapi import APIRouter, Query, Depends
+from app.core.logging import SAMPLED
+from app.core.metrics import time_stage
+from app.schemas.learning_pack import LearningPackResponse
+from app.services.learning_pack import generate_learning_pack_from_youtube
+from app.security.auth import validate_api_key
+from app.utils.validators import validate_youtube_url, validate_language, validate_num_questions
+from app.utils.exceptions import APIException
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix="/learning-pack",
+    tags=["Learning Pack"],
+    dependencies=[Depends(validate_api_key)]
+)
+
+@router.get(
+    "/",
+    response_model=LearningPackResponse,
+    summary="Generate a summary and a quiz from a YouTube video transcript",
+    description="Returns both the summary and the quiz of the provided YouTube video, fetching its transcript only once.",
+    responses={
+        200: {"description": "Learning pack generated successfully"},
+        400: {"description": "Invalid input parameters (invalid URL, language, or number of questions)"},
+        422: {"description": "Invalid YouTube URL or validation error"},
+        503: {"description": "External service unavailable or overloaded (see the Retry-After header)"},
+    }
+)
+async def generate_learning_pack(
+    youtube_url: str = Query(
+        ...,
+        description="YouTube video URL",
+        example="https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+    ),
+    language: str = Query(
+        "en",
+        description="Language code for the summary and quiz (e.g., 'en', 'es', 'fr')",
+        pattern="^[a-z]{2}$",
+        example="en"
+    ),
+    num_questions: int = Query(
+        5,
+        description="Number of questions to generate (1-20)",
+        example=5,
+        ge=1,
+        le=20
+    )
+):
+    """Endpoint to generate a summary and a quiz from a YouTube video transcript."""
+    try:
+        with time_stage("validate"):
+            validated_url = validate_youtube_url(youtube_url)
+            validated_language = validate_language(language)
+            validated_num_questions = validate_num_questions(num_questions)
+        logger.info(
+            "Learning pack request: URL=%s, Language=%s, Questions=%s",
+            validated_url, validated_language, validated_num_questions,
+            extra=SAMPLED
+        )
+        pack = await generate_learning_pack_from_youtube(
+            validated_url,
+            validated_language,
+            validated_num_questions
+        )
+        logger.info("Learning pack generated successfully for URL: %s", validated_url, extra=SAMPLED)
+        return pack
+    except APIException as e:
+        logger.error("APIException: %s", e.detail)
+        raise
+    except Exception as e:
+        logger.error("Unexpected error in learning pack generation: %s", e)
+        raise APIException(
+            status_code=500,
+            detail="An unexpected error occurred while generating the learning pack"
+        )
@@ -1,9 +1,12 @@
 import logging
-from fastapi import APIRouter, Query, Depends, BackgroundTasks
-from app.schemas.quiz import QuizResponse
+from fastapi import APIRouter, Query, Depends
+from app.core.logging import SAMPLED
+from app.core.metrics import time_stage
+from app.schemas.quiz import QuizResponse, MultiLanguageQuizResponse
 from app.services.quiz import generate_quiz_from_youtube
+from app.services.translation import generate_multilingual_quiz
 from app.security.auth import validate_api_key
-from app.utils.validators import validate_youtube_url, validate_language, validate_num_questions
+from app.utils.validators import validate_youtube_url, validate_language, validate_languages, validate_num_questions
 from app.utils.exceptions import APIException
 
 logger = logging.getLogger(__name__)
@@ -22,11 +25,10 @@ router = APIRouter(
         200: {"description": "Quiz generated successfully"},
         400: {"description": "Invalid input parameters (invalid URL, language, or number of questions)"},
         422: {"description": "Invalid YouTube URL or validation error"},
-        503: {"description": "External service unavailable"},
+        503: {"description": "External service unavailable or overloaded (see the Retry-After header)"},
     }
 )
 async def generate_quiz(
-    background_tasks: BackgroundTasks,
     youtube_url: str = Query(
         ...,
         description="YouTube video URL",
@@ -47,29 +49,101 @@ async def generate_quiz(
 ):
     """Endpoint to generate a quiz from a YouTube video transcript."""
     try:
-        validated_url = validate_youtube_url(youtube_url)
-        validated_language = validate_language(language)
-        validated_num_questions = validate_num_questions(num_questions)
+        with time_stage("validate"):
+            validated_url = validate_youtube_url(youtube_url)
+            validated_language = validate_language(language)
+            validated_num_questions = validate_num_questions(num_questions)
         logger.info(
-            f"Quiz request: URL={validated_url}, Language={validated_language}, "
-            f"Questions={validated_num_questions}"
+            "Quiz request: URL=%s, Language=%s, Questions=%s",
+            validated_url, validated_language, validated_num_questions,
+            extra=SAMPLED
         )
         quiz_questions = await generate_quiz_from_youtube(
             validated_url,
             validated_language,
             validated_num_questions
         )
-        background_tasks.add_task(
-            logger.info,
-            f"Quiz generated successfully for URL: {validated_url} "
-            f"with {len(quiz_questions)} questions"
+        logger.info(
+            "Quiz generated successfully for URL: %s with %s questions",
+            validated_url, len(quiz_questions),
+            extra=SAMPLED
         )
         return QuizResponse(quiz=quiz_questions)
     except APIException as e:
-        logger.error(f"APIException: {e.detail}")
+        logger.error("APIException: %s", e.detail)
+        raise
+    except Exception as e:
+        logger.error("Unexpected error in quiz generation: %s", e)
+        raise APIException(
+            status_code=500,
+            detail="An unexpected error occurred while generating the quiz"
+        )
+
+
+@router.get(
+    "/languages",
+    response_model=MultiLanguageQuizResponse,
+    summary="Generate a quiz in several languages",
+    description=(
+        "Generates the quiz once in the source language and translates it into each other requested "
+        "language concurrently, keeping which answers are correct. Each language is cached under the same key as `/quiz/`."
+    ),
+    responses={
+        200: {"description": "Quizzes keyed by language, with the languages that failed under `errors`"},
+        400: {"description": "Invalid input parameters (invalid URL, languages, or number of questions)"},
+        422: {"description": "Invalid YouTube URL or validation error"},
+        503: {"description": "External service unavailable or overloaded (see the Retry-After header)"},
+    }
+)
+async def generate_multilingual_quizzes(
+    youtube_url: str = Query(
+        ...,
+        description="YouTube video URL",
+        example="https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+    ),
+    languages: list[str] = Query(
+        ...,
+        description="Language codes for the quizzes, repeated (e.g., languages=en&languages=es)",
+        example=["en", "es"]
+    ),
+    num_questions: int = Query(
+        5,
+        description="Number of questions to generate (1-20)",
+        example=5,
+        ge=1,
+        le=20
+    ),
+    source_language: str | None = Query(
+        None,
+        description="Language generated from the transcript; defaults to the first of languages",
+        pattern="^[a-z]{2}$",
+        example="en"
+    )
+):
+    """Endpoint to generate the quiz of a YouTube video in several languages."""
+    try:
+        with time_stage("validate"):
+            validated_url = validate_youtube_url(youtube_url)
+            validated_languages = validate_languages(languages)
+            validated_num_questions = validate_num_questions(num_questions)
+            validated_source = validate_language(source_language) if source_language else None
+        logger.info(
+            "Multi-language quiz request: URL=%s, Languages=%s, Questions=%s",
+            validated_url, validated_languages, validated_num_questions,
+            extra=SAMPLED
+        )
+        quizzes, errors = await generate_multilingual_quiz(
+            validated_url,
+            validated_languages,
+            validated_num_questions,
+            validated_source
+        )
+        return MultiLanguageQuizResponse(quizzes=quizzes, errors=errors)
+    except APIException as e:
+        logger.error("APIException: %s", e.detail)
         raise
     except Exception as e:
-        logger.error(f"Unexpected error in quiz generation: {str(e)}")
+        logger.error("Unexpected error in multi-language quiz generation: %s", e)
         raise APIException(
             status_code=500,
             detail="An unexpected error occurred while generating the quiz"
@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Depends
+from app.services.cache import cache_stats
+from app.services.governor import governor_stats
+from app.services.singleflight import single_flight_stats
+from app.services.similarity import similarity_stats
+from app.security.auth import validate_api_key
+
+router = APIRouter(
+    prefix="/stats",
+    tags=["Stats"],
+    dependencies=[Depends(validate_api_key)]
+)
+
+@router.get(
+    "/",
+    summary="Internal cache and coalescing counters",
+    description="Returns per-process counters: cache hits, misses and evictions per tier, and how many requests were coalesced into an in-flight generation.",
+)
+async def get_stats():
+    """Endpoint to inspect the service counters of this worker."""
+    return {"cache": cache_stats(), "single_flight": single_flight_stats(), "governors": governor_stats(), "similarity": similarity_stats()}
@@ -1,9 +1,15 @@
+import json
 import logging
-from fastapi import APIRouter, Query, Depends, BackgroundTasks
-from app.schemas.summary import SummaryResponse
-from app.services.summary import generate_summary_from_youtube
+from collections.abc import AsyncIterator
+from fastapi import APIRouter, Query, Depends
+from fastapi.responses import StreamingResponse
+from app.core.logging import SAMPLED
+from app.core.metrics import time_stage
+from app.schemas.summary import SummaryResponse, MultiLanguageSummaryResponse
+from app.services.summary import generate_summary_from_youtube, stream_summary_from_youtube
+from app.services.translation import generate_multilingual_summary
 from app.security.auth import validate_api_key
-from app.utils.validators import validate_youtube_url, validate_language
+from app.utils.validators import validate_youtube_url, validate_language, validate_languages
 from app.utils.exceptions import APIException
 
 logger = logging.getLogger(__name__)
@@ -22,11 +28,10 @@ router = APIRouter(
         200: {"description": "Summary generated successfully"},
         400: {"description": "Invalid input parameters (invalid URL or language)"},
         422: {"description": "Invalid YouTube URL or validation error"},
-        503: {"description": "External service unavailable"},
+        503: {"description": "External service unavailable or overloaded (see the Retry-After header)"},
     }
 )
 async def generate_summary(
-    background_tasks: BackgroundTasks,
     youtube_url: str = Query(
         ...,
         description="YouTube video URL",
@@ -41,20 +46,126 @@ async def generate_summary(
 ):
     """Endpoint to generate a summary from a YouTube video transcript."""
     try:
-        validated_url = validate_youtube_url(youtube_url)
-        validated_language = validate_language(language)
-        logger.info(f"Summary request: URL={validated_url}, Language={validated_language}")
+        with time_stage("validate"):
+            validated_url = validate_youtube_url(youtube_url)
+            validated_language = validate_language(language)
+        logger.info("Summary request: URL=%s, Language=%s", validated_url, validated_language, extra=SAMPLED)
         summary = await generate_summary_from_youtube(validated_url, validated_language)
-        background_tasks.add_task(
-            logger.info,
-            f"Summary generated successfully for URL: {validated_url}"
-        )
+        logger.info("Summary generated successfully for URL: %s", validated_url, extra=SAMPLED)
         return SummaryResponse(summary=summary)
     except APIException as e:
-        logger.error(f"APIException: {e.detail}")
+        logger.error("APIException: %s", e.detail)
+        raise
+    except Exception as e:
+        logger.error("Unexpected error in summary generation: %s", e)
+        raise APIException(
+            status_code=500,
+            detail="An unexpected error occurred while generating the summary"
+        )
+
+
+async def summary_event_stream(youtube_url: str, language: str) -> AsyncIterator[str]:
+    """Wrap the summary deltas as Server-Sent Events."""
+    try:
+        async for delta in stream_summary_from_youtube(youtube_url, language):
+            yield f"data: {json.dumps({'delta': delta})}\n\n"
+        yield "event: done\ndata: {}\n\n"
+    except APIException as e:
+        logger.error("APIException during summary stream: %s", e.detail)
+        yield f"event: error\ndata: {json.dumps({'status_code': e.status_code, 'detail': e.detail})}\n\n"
+    except Exception as e:
+        logger.error("Unexpected error in summary stream: %s", e)
+        detail = "An unexpected error occurred while generating the summary"
+        yield f"event: error\ndata: {json.dumps({'status_code': 500, 'detail': detail})}\n\n"
+
+
+@router.get(
+    "/stream",
+    summary="Stream a summary from a YouTube video transcript",
+    description=(
+        "Streams the summary as Server-Sent Events. Each `data` event carries a JSON object "
+        "with a `delta` text fragment; the stream ends with a `done` event, or an `error` event on failure."
+    ),
+    response_class=StreamingResponse,
+    responses={
+        200: {"description": "Summary stream", "content": {"text/event-stream": {}}},
+        400: {"description": "Invalid input parameters (invalid URL or language)"},
+        422: {"description": "Invalid YouTube URL or validation error"},
+    }
+)
+async def stream_summary(
+    youtube_url: str = Query(
+        ...,
+        description="YouTube video URL",
+        example="https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+    ),
+    language: str = Query(
+        "en",
+        description="Language code for the summary (e.g., 'en', 'es', 'fr')",
+        pattern="^[a-z]{2}$",
+        example="en"
+    )
+):
+    """Endpoint to stream a summary from a YouTube video transcript."""
+    validated_url = validate_youtube_url(youtube_url)
+    validated_language = validate_language(language)
+    logger.info("Summary stream request: URL=%s, Language=%s", validated_url, validated_language, extra=SAMPLED)
+    return StreamingResponse(
+        summary_event_stream(validated_url, validated_language),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get(
+    "/languages",
+    response_model=MultiLanguageSummaryResponse,
+    summary="Generate a summary in several languages",
+    description=(
+        "Summarizes the transcript once in the source language and translates that summary into each "
+        "other requested language concurrently. Each language is cached under the same key as `/summary/`."
+    ),
+    responses={
+        200: {"description": "Summaries keyed by language, with the languages that failed under `errors`"},
+        400: {"description": "Invalid input parameters (invalid URL or languages)"},
+        422: {"description": "Invalid YouTube URL or validation error"},
+        503: {"description": "External service unavailable or overloaded (see the Retry-After header)"},
+    }
+)
+async def generate_multilingual_summaries(
+    youtube_url: str = Query(
+        ...,
+        description="YouTube video URL",
+        example="https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+    ),
+    languages: list[str] = Query(
+        ...,
+        description="Language codes for the summaries, repeated (e.g., languages=en&languages=es)",
+        example=["en", "es"]
+    ),
+    source_language: str | None = Query(
+        None,
+        description="Language summarized from the transcript; defaults to the first of languages",
+        pattern="^[a-z]{2}$",
+        example="en"
+    )
+):
+    """Endpoint to generate the summary of a YouTube video in several languages."""
+    try:
+        with time_stage("validate"):
+            validated_url = validate_youtube_url(youtube_url)
+            validated_languages = validate_languages(languages)
+            validated_source = validate_language(source_language) if source_language else None
+        logger.info(
+            "Multi-language summary request: URL=%s, Languages=%s", validated_url, validated_languages, extra=SAMPLED
+        )
+        summaries, errors = await generate_multilingual_summary(validated_url, validated_languages, validated_source)
+        return MultiLanguageSummaryResponse(summaries=summaries, errors=errors)
+    except APIException as e:
+        logger.error("APIException: %s", e.detail)
         raise
     except Exception as e:
-        logger.error(f"Unexpected error in summary generation: {str(e)}")
+        logger.error("Unexpected error in multi-language summary generation: %s", e)
         raise APIException(
             status_code=500,
             detail="An unexpected error occurred while generating the summary"
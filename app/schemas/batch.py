@@ -0,0 +1,8 @@
+from typing import Literal
+from pydantic import BaseModel, Field
+
+class BatchRequest(BaseModel):
+    youtube_urls: list[str] = Field(..., min_length=1, max_length=200)
+    mode: Literal["summary", "quiz", "both"] = "both"
+    language: str = Field("en", pattern="^[a-z]{2}$")
+    num_questions: int = Field(5, ge=1, le=20)
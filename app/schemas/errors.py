@@ -0,0 +1,5 @@
+from pydantic import BaseModel
+
+class ErrorDetail(BaseModel):
+    status_code: int
+    detail: str
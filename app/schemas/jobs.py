@@ -0,0 +1,29 @@
+from typing import Literal
+from pydantic import BaseModel, Field, HttpUrl
+from app.schemas.quiz import QuizQuestion
+
+class JobRequest(BaseModel):
+    kind: Literal["summary", "quiz"]
+    youtube_url: str
+    language: str = Field("en", pattern="^[a-z]{2}$")
+    num_questions: int = Field(5, ge=1, le=20)
+    webhook_url: HttpUrl | None = None
+
+class JobError(BaseModel):
+    status_code: int
+    detail: str
+
+class JobStatus(BaseModel):
+    job_id: str
+    status: Literal["queued", "running", "completed", "failed"]
+    kind: Literal["summary", "quiz"]
+    youtube_url: str
+    language: str
+    num_questions: int
+    result: str | list[QuizQuestion] | None = None
+    error: JobError | None = None
+    created_at: float
+    updated_at: float
+
+class Job(JobStatus):
+    webhook_url: str | None = None
@@ -0,0 +1,6 @@
+from pydantic import BaseModel
+from app.schemas.quiz import QuizQuestion
+
+class LearningPackResponse(BaseModel):
+    summary: str
+    quiz: list[QuizQuestion]
@@ -1,5 +1,6 @@
 from pydantic import BaseModel, field_validator
 from urllib.parse import urlparse
+from app.schemas.errors import ErrorDetail
 
 class QuizRequest(BaseModel):
     youtube_url: str
@@ -23,5 +24,12 @@ class QuizQuestion(BaseModel):
     type: str
     answers: list[QuizAnswer]
 
+class QuizEnvelope(BaseModel):
+    questions: list[QuizQuestion]
+
 class QuizResponse(BaseModel):
     quiz: list[QuizQuestion]
+
+class MultiLanguageQuizResponse(BaseModel):
+    quizzes: dict[str, list[QuizQuestion]]
+    errors: dict[str, ErrorDetail] = {}
@@ -1,5 +1,6 @@
 from pydantic import BaseModel, field_validator
 from urllib.parse import urlparse
+from app.schemas.errors import ErrorDetail
 
 class SummaryRequest(BaseModel):
     youtube_url: str
@@ -16,3 +17,7 @@ class SummaryRequest(BaseModel):
 
 class SummaryResponse(BaseModel):
     summary: str
+
+class MultiLanguageSummaryResponse(BaseModel):
+    summaries: dict[str, str]
+    errors: dict[str, ErrorDetail] = {}
@@ -0,0 +1,6 @@
+from pydantic import BaseModel
+
+class PreprocessedTranscript(BaseModel):
+    text: str
+    original_tokens: int
+    tokens: int
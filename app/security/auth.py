@@ -1,13 +1,20 @@
 from fastapi import Security, HTTPException, status
 from fastapi.security.api_key import APIKeyHeader
+import logging
 import os
+import secrets
 
 API_KEY_NAME = "API-Key"
 API_KEY = os.getenv("API_KEY")
 api_key_header = APIKeyHeader(name=API_KEY_NAME, auto_error=False)
 
+logger = logging.getLogger(__name__)
+
 async def validate_api_key(api_key_header: str = Security(api_key_header)):
-    if api_key_header == API_KEY:
+    """Check the API-Key header. Every request is rejected if API_KEY is not configured."""
+    if not API_KEY:
+        logger.error("API_KEY is not set, rejecting request")
+    elif api_key_header and secrets.compare_digest(api_key_header.encode("utf-8"), API_KEY.encode("utf-8")):
         return api_key_header
     raise HTTPException(
         status_code=status.HTTP_403_FORBIDDEN,
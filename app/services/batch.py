@@ -0,0 +1,106 @@
+import asyncio
+import logging
+import os
+from collections.abc import AsyncIterator
+from typing import Any
+from app.schemas.batch import BatchRequest
+from app.services.cache_keys import summary_cache_key, quiz_cache_key
+from app.services.cache import cache_mget
+from app.services.quiz import generate_quiz_from_youtube
+from app.services.summary import generate_summary_from_youtube
+from app.services.youtube import extract_youtube_id, canonical_video_url
+from app.utils.exceptions import APIException
+from app.utils.validators import validate_youtube_url, validate_language
+
+BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", "8"))
+
+logger = logging.getLogger(__name__)
+
+
+def _group_by_video_id(youtube_urls: list[str]) -> tuple[dict[str, list[str]], list[dict]]:
+    """Deduplicate the requested URLs by video ID, collecting per-URL validation errors."""
+    videos: dict[str, list[str]] = {}
+    errors = []
+    for url in youtube_urls:
+        try:
+            video_id = extract_youtube_id(validate_youtube_url(url))
+        except APIException as e:
+            errors.append({"youtube_urls": [url], "error": {"status_code": e.status_code, "detail": e.detail}})
+            continue
+        videos.setdefault(video_id, []).append(url)
+    return videos, errors
+
+
+async def _process_video(
+    video_id: str,
+    urls: list[str],
+    request: BatchRequest,
+    language: str,
+    cached: dict[str, Any],
+    semaphore: asyncio.Semaphore,
+) -> dict:
+    """Resolve one video from the prefetched cache values, generating whatever is missing."""
+    result = {"video_id": video_id, "youtube_urls": urls}
+    video_url = canonical_video_url(video_id)
+    try:
+        if request.mode in ("summary", "both"):
+            if cached.get("summary") is not None:
+                result["summary"] = cached["summary"]
+            else:
+                async with semaphore:
+                    result["summary"] = await generate_summary_from_youtube(video_url, language)
+        if request.mode in ("quiz", "both"):
+            questions = cached.get("quiz")
+            if questions is None:
+                async with semaphore:
+                    questions = await generate_quiz_from_youtube(video_url, language, request.num_questions)
+            result["quiz"] = [q.model_dump() for q in questions]
+    except APIException as e:
+        result["error"] = {"status_code": e.status_code, "detail": e.detail}
+    except Exception as e:
+        logger.error("Unexpected error in batch item %s: %s", video_id, e)
+        result["error"] = {"status_code": 500, "detail": "An unexpected error occurred while processing the video"}
+    return result
+
+
+async def run_batch(request: BatchRequest) -> AsyncIterator[dict]:
+    """
+    Summarize and/or quiz many videos, yielding one result per unique video as it completes.
+
+    Cache hits for every video are resolved with a single MGET; misses go through the
+    regular generation services with at most BATCH_MAX_CONCURRENCY generations at a time.
+    Failures are reported per item instead of aborting the batch.
+    """
+    language = validate_language(request.language)
+    videos, errors = _group_by_video_id(request.youtube_urls)
+    for error in errors:
+        yield error
+    if not videos:
+        return
+    kinds = []
+    if request.mode in ("summary", "both"):
+        kinds.append(("summary", lambda video_id: summary_cache_key(video_id, language)))
+    if request.mode in ("quiz", "both"):
+        kinds.append(("quiz", lambda video_id: quiz_cache_key(video_id, language, request.num_questions)))
+    video_ids = list(videos)
+    entries = [(kind, build_key(video_id)) for video_id in video_ids for kind, build_key in kinds]
+    values = await cache_mget(entries)
+    cached = {
+        video_id: {kind: values[i * len(kinds) + j] for j, (kind, _) in enumerate(kinds)}
+        for i, video_id in enumerate(video_ids)
+    }
+    logger.info(
+        "Batch of %s videos: %s of %s results served from cache",
+        len(video_ids), sum(1 for v in values if v is not None), len(entries)
+    )
+    semaphore = asyncio.Semaphore(BATCH_MAX_CONCURRENCY)
+    tasks = [
+        asyncio.ensure_future(_process_video(video_id, videos[video_id], request, language, cached[video_id], semaphore))
+        for video_id in video_ids
+    ]
+    try:
+        for next_result in asyncio.as_completed(tasks):
+            yield await next_result
+    finally:
+        for task in tasks:
+            task.cancel()
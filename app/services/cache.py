@@ -0,0 +1,329 @@
+import asyncio
+import logging
+import os
+import uuid
+from collections import Counter
+from typing import Any, Awaitable, Callable
+from pydantic import TypeAdapter
+from app.core.metrics import time_stage, record_cache_lookup
+from app.schemas.learning_pack import LearningPackResponse
+from app.schemas.quiz import QuizQuestion
+from app.schemas.transcript import PreprocessedTranscript
+from app.services.cache_codec import encode_payload, decode_payload
+from app.services.local_cache import LocalCache
+from app.services.redis_client import get_redis_client, get_blocking_redis_client
+
+logger = logging.getLogger(__name__)
+
+_quiz_adapter = TypeAdapter(list[QuizQuestion])
+
+_text_serializer: tuple[Callable[[Any], bytes], Callable[[bytes], Any]] = (
+    lambda value: value.encode("utf-8"),
+    lambda data: data.decode("utf-8"),
+)
+
+# Per kind: (serialize value -> bytes, deserialize bytes -> value).
+CACHE_SERIALIZERS: dict[str, tuple[Callable[[Any], bytes], Callable[[bytes], Any]]] = {
+    "transcript": _text_serializer,
+    "transcript_preprocessed": (
+        lambda transcript: transcript.model_dump_json().encode("utf-8"),
+        PreprocessedTranscript.model_validate_json,
+    ),
+    "summary": _text_serializer,
+    "summary_chunk": _text_serializer,
+    "quiz": (_quiz_adapter.dump_json, _quiz_adapter.validate_json),
+    "quiz_pool": (_quiz_adapter.dump_json, _quiz_adapter.validate_json),
+    "learning_pack": (
+        lambda pack: pack.model_dump_json().encode("utf-8"),
+        LearningPackResponse.model_validate_json,
+    ),
+}
+
+_DEFAULT_TTLS = {
+    "transcript_preprocessed": 24 * 60 * 60,
+    "summary_chunk": 24 * 60 * 60,
+    "quiz_pool": 24 * 60 * 60,
+}
+
+# Seconds each kind is kept in Redis, overridable with <KIND>_CACHE_TTL.
+CACHE_TTLS: dict[str, int] = {
+    kind: int(os.getenv(f"{kind.upper()}_CACHE_TTL", str(_DEFAULT_TTLS.get(kind, 60 * 60))))
+    for kind in CACHE_SERIALIZERS
+}
+
+# Seconds after which a value is served stale while it is refreshed in the background,
+# overridable with <KIND>_CACHE_SOFT_TTL. Defaults to three quarters of the hard TTL.
+CACHE_SOFT_TTLS: dict[str, int] = {
+    kind: min(int(os.getenv(f"{kind.upper()}_CACHE_SOFT_TTL", str(ttl * 3 // 4))), ttl)
+    for kind, ttl in CACHE_TTLS.items()
+}
+CACHE_REFRESH_MIN_HITS = int(os.getenv("CACHE_REFRESH_MIN_HITS", "2"))
+CACHE_ACCESS_COUNT_MAX_KEYS = int(os.getenv("CACHE_ACCESS_COUNT_MAX_KEYS", "10000"))
+
+L1_CACHE_ENABLED = os.getenv("L1_CACHE_ENABLED", "true").lower() == "true"
+L1_CACHE_MAX_ENTRIES = int(os.getenv("L1_CACHE_MAX_ENTRIES", "512"))
+L1_CACHE_MAX_BYTES = int(os.getenv("L1_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+L1_CACHE_TTL = float(os.getenv("L1_CACHE_TTL", "300"))
+CACHE_INVALIDATION_CHANNEL = os.getenv("CACHE_INVALIDATION_CHANNEL", "cache:invalidate")
+CACHE_INVALIDATION_MAX_BACKOFF = float(os.getenv("CACHE_INVALIDATION_MAX_BACKOFF", "30"))
+
+local_cache = LocalCache(L1_CACHE_MAX_ENTRIES, L1_CACHE_MAX_BYTES, L1_CACHE_TTL)
+_redis_stats: Counter = Counter()
+_worker_id = uuid.uuid4().hex
+_invalidation_task: asyncio.Task | None = None
+_access_counts: Counter = Counter()
+_refreshing: dict[str, asyncio.Task] = {}
+
+
+def encode_value(kind: str, value: Any) -> bytes:
+    """Serialize and encode a value of the given kind for storage."""
+    serialize, _ = CACHE_SERIALIZERS[kind]
+    return encode_payload(serialize(value))
+
+
+def _decode(kind: str, key: str, blob: bytes | None) -> tuple[Any | None, int]:
+    """Decode a stored value, returning it with its serialized size."""
+    if blob is None:
+        return None, 0
+    data = decode_payload(blob)
+    if data is None:
+        logger.info("Skipping cache entry with unknown format: %s", key)
+        return None, 0
+    _, deserialize = CACHE_SERIALIZERS[kind]
+    try:
+        return deserialize(data), len(data)
+    except ValueError as e:
+        logger.warning("Skipping invalid cache entry %s: %s", key, e)
+        return None, 0
+
+
+def decode_value(kind: str, key: str, blob: bytes | None) -> Any | None:
+    """Decode a stored value of the given kind. Unreadable or outdated entries count as misses."""
+    return _decode(kind, key, blob)[0]
+
+
+def _remember(kind: str, key: str, blob: bytes | None, l1_ttl: float | None = None) -> Any | None:
+    """Decode a value read from Redis, counting the lookup and keeping hits in the L1 cache."""
+    value, size = _decode(kind, key, blob)
+    record_cache_lookup(kind, "redis", value is not None)
+    if value is None:
+        _redis_stats["misses"] += 1
+        return None
+    _redis_stats["hits"] += 1
+    if L1_CACHE_ENABLED and (l1_ttl is None or l1_ttl > 0):
+        local_cache.set(key, value, size, min(CACHE_TTLS[kind], l1_ttl or CACHE_TTLS[kind]))
+    return value
+
+
+def _count_access(key: str) -> int:
+    """Count a read of a key since it was last written, bounding the number of tracked keys."""
+    if key not in _access_counts and len(_access_counts) >= CACHE_ACCESS_COUNT_MAX_KEYS:
+        _access_counts.clear()
+    _access_counts[key] += 1
+    return _access_counts[key]
+
+
+async def _run_refresh(key: str, refresh: Callable[[], Awaitable[Any]]) -> None:
+    try:
+        await refresh()
+        _redis_stats["refreshes"] += 1
+    except Exception as e:
+        _redis_stats["refresh_failures"] += 1
+        logger.warning("Background refresh of %s failed: %s", key, e)
+    finally:
+        _refreshing.pop(key, None)
+
+
+def _schedule_refresh(key: str, refresh: Callable[[], Awaitable[Any]]) -> None:
+    """Refresh a stale key in the background, once per key, if it was read often enough."""
+    if key in _refreshing:
+        return
+    if _access_counts[key] < CACHE_REFRESH_MIN_HITS:
+        _redis_stats["refresh_skipped"] += 1
+        return
+    _refreshing[key] = asyncio.create_task(_run_refresh(key, refresh))
+
+
+async def cache_get(kind: str, key: str, refresh: Callable[[], Awaitable[Any]] | None = None) -> Any | None:
+    """
+    Return the cached value for a key from the L1 cache or Redis, or None on a miss.
+
+    With refresh, values older than the soft TTL of their kind are still returned and
+    refresh is scheduled in the background, provided the key was read at least
+    CACHE_REFRESH_MIN_HITS times since it was written. Past the hard TTL the key is
+    gone from Redis and the caller regenerates it synchronously.
+    """
+    if L1_CACHE_ENABLED:
+        value = local_cache.get(key)
+        record_cache_lookup(kind, "l1", value is not None)
+        if value is not None:
+            if refresh is not None:
+                _count_access(key)
+            return value
+    if refresh is None:
+        with time_stage("redis_get"):
+            blob = await get_redis_client().get(key)
+        return _remember(kind, key, blob)
+    with time_stage("redis_get"):
+        pipe = get_redis_client().pipeline(transaction=False)
+        pipe.get(key)
+        pipe.pttl(key)
+        blob, pttl = await pipe.execute()
+    # The Redis TTL counts down from the hard TTL, so the value turns stale once less than
+    # hard - soft is left. L1 copies expire at that point so staleness is noticed here.
+    fresh_for = pttl / 1000 - (CACHE_TTLS[kind] - CACHE_SOFT_TTLS[kind]) if pttl >= 0 else None
+    value = _remember(kind, key, blob, fresh_for)
+    if value is not None:
+        _count_access(key)
+        if fresh_for is not None and fresh_for <= 0:
+            _redis_stats["stale_hits"] += 1
+            _schedule_refresh(key, refresh)
+    return value
+
+
+async def cache_mget(entries: list[tuple[str, str]]) -> list[Any | None]:
+    """Return the cached values for several (kind, key) pairs, reading L1 misses with a single MGET."""
+    values: list[Any | None] = [None] * len(entries)
+    if L1_CACHE_ENABLED:
+        for i, (kind, key) in enumerate(entries):
+            values[i] = local_cache.get(key)
+            record_cache_lookup(kind, "l1", values[i] is not None)
+    missing = [i for i, value in enumerate(values) if value is None]
+    if missing:
+        with time_stage("redis_mget"):
+            blobs = await get_redis_client().mget([entries[i][1] for i in missing])
+        for i, blob in zip(missing, blobs):
+            values[i] = _remember(entries[i][0], entries[i][1], blob)
+    return values
+
+
+async def cache_set(kind: str, key: str, value: Any, ttl: int | None = None, keep_longer_ttl: bool = False) -> None:
+    """
+    Store a value under a key with the TTL configured for its kind, invalidating other workers' L1 copies.
+
+    With keep_longer_ttl, a key that already has more time left than that TTL keeps its
+    remaining time, so rewriting content pinned with cache_expire does not shorten it.
+    """
+    serialize, _ = CACHE_SERIALIZERS[kind]
+    data = serialize(value)
+    with time_stage("redis_setex"):
+        if keep_longer_ttl:
+            remaining_ms = await get_redis_client().pttl(key)
+            ttl_ms = max(remaining_ms, (ttl or CACHE_TTLS[kind]) * 1000)
+            await get_redis_client().set(key, encode_payload(data), px=ttl_ms)
+        else:
+            await get_redis_client().setex(key, ttl or CACHE_TTLS[kind], encode_payload(data))
+    _access_counts.pop(key, None)
+    if L1_CACHE_ENABLED:
+        local_cache.set(key, value, len(data), ttl or CACHE_SOFT_TTLS[kind])
+        await get_redis_client().publish(CACHE_INVALIDATION_CHANNEL, f"{_worker_id}:{key}")
+
+
+async def cache_expire(keys: list[str], ttl: int) -> None:
+    """Set a new TTL on existing Redis keys, for example to pin catalog content for longer."""
+    pipe = get_redis_client().pipeline(transaction=False)
+    for key in keys:
+        pipe.expire(key, ttl)
+    await pipe.execute()
+
+
+async def cache_delete(key: str) -> None:
+    """Delete a key from Redis and from every worker's L1 cache."""
+    await get_redis_client().delete(key)
+    if L1_CACHE_ENABLED:
+        local_cache.invalidate(key)
+        await get_redis_client().publish(CACHE_INVALIDATION_CHANNEL, f"{_worker_id}:{key}")
+
+
+def cache_stats() -> dict[str, dict[str, int]]:
+    """Return hit/miss/eviction counters for the L1 and Redis tiers and background refreshes of this worker."""
+    return {
+        "l1": {
+            "hits": local_cache.stats["hits"],
+            "misses": local_cache.stats["misses"],
+            "evictions": local_cache.stats["evictions"],
+            "expirations": local_cache.stats["expirations"],
+            "invalidations": local_cache.stats["invalidations"],
+            "entries": len(local_cache),
+            "bytes": local_cache.total_bytes,
+        },
+        "redis": {
+            "hits": _redis_stats["hits"],
+            "misses": _redis_stats["misses"],
+        },
+        "revalidation": {
+            "stale_hits": _redis_stats["stale_hits"],
+            "refreshes": _redis_stats["refreshes"],
+            "refresh_failures": _redis_stats["refresh_failures"],
+            "refresh_skipped": _redis_stats["refresh_skipped"],
+            "in_flight": len(_refreshing),
+        },
+    }
+
+
+async def _listen_for_invalidations() -> None:
+    """
+    Drop L1 entries written or deleted by other workers.
+
+    Reconnects with exponential backoff while Redis is unreachable, including when it
+    is not up yet at startup. The L1 cache is cleared on every (re)connect, since
+    invalidations published while disconnected were missed. Subscribes on the blocking
+    client, so a quiet channel does not time out and reconnect every REDIS_SOCKET_TIMEOUT.
+    """
+    delay = 1.0
+    while True:
+        pubsub = None
+        try:
+            pubsub = get_blocking_redis_client().pubsub()
+            await pubsub.subscribe(CACHE_INVALIDATION_CHANNEL)
+            local_cache.clear()
+            delay = 1.0
+            async for message in pubsub.listen():
+                if message["type"] != "message":
+                    continue
+                data = message["data"]
+                origin, _, key = (data.decode("utf-8") if isinstance(data, bytes) else data).partition(":")
+                if origin != _worker_id:
+                    local_cache.invalidate(key)
+        except Exception as e:
+            logger.warning("Cache invalidation listener disconnected, retrying in %.0fs: %s", delay, e)
+        finally:
+            if pubsub is not None:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+        local_cache.clear()
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, CACHE_INVALIDATION_MAX_BACKOFF)
+
+
+def _on_listener_done(task: asyncio.Task) -> None:
+    """Restart the invalidation listener if it stopped for any reason other than shutdown."""
+    global _invalidation_task
+    if task is not _invalidation_task or task.cancelled():
+        return
+    logger.error("Cache invalidation listener stopped, restarting it: %s", task.exception())
+    local_cache.clear()
+    _invalidation_task = None
+    start_cache_invalidation_listener()
+
+
+def start_cache_invalidation_listener() -> None:
+    """Start listening for cross-worker L1 invalidations. Called on startup by every process using the cache."""
+    global _invalidation_task
+    if L1_CACHE_ENABLED and _invalidation_task is None:
+        _invalidation_task = asyncio.create_task(_listen_for_invalidations())
+        _invalidation_task.add_done_callback(_on_listener_done)
+
+
+async def stop_cache_invalidation_listener() -> None:
+    """Stop the invalidation listener. Called on shutdown by every process that started it."""
+    global _invalidation_task
+    task, _invalidation_task = _invalidation_task, None
+    if task is not None:
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
@@ -0,0 +1,64 @@
+import logging
+import os
+import zlib
+import zstandard
+
+logger = logging.getLogger(__name__)
+
+# Header: 2-byte magic, 1-byte schema version, 1-byte compression id.
+CACHE_MAGIC = b"YC"
+CACHE_SCHEMA_VERSION = 1
+HEADER_SIZE = 4
+
+COMPRESSION_NONE = 0
+COMPRESSION_ZLIB = 1
+COMPRESSION_ZSTD = 2
+
+_COMPRESSION_IDS = {"none": COMPRESSION_NONE, "zlib": COMPRESSION_ZLIB, "zstd": COMPRESSION_ZSTD}
+
+CACHE_COMPRESSION = os.getenv("CACHE_COMPRESSION", "zstd").lower()
+CACHE_COMPRESS_MIN_BYTES = int(os.getenv("CACHE_COMPRESS_MIN_BYTES", "1024"))
+CACHE_ZSTD_LEVEL = int(os.getenv("CACHE_ZSTD_LEVEL", "3"))
+CACHE_ZLIB_LEVEL = int(os.getenv("CACHE_ZLIB_LEVEL", "6"))
+
+if CACHE_COMPRESSION not in _COMPRESSION_IDS:
+    raise ValueError(f"CACHE_COMPRESSION must be one of {sorted(_COMPRESSION_IDS)}")
+
+_zstd_compressor = zstandard.ZstdCompressor(level=CACHE_ZSTD_LEVEL)
+_zstd_decompressor = zstandard.ZstdDecompressor()
+
+
+def encode_payload(data: bytes, compression: str = CACHE_COMPRESSION) -> bytes:
+    """Wrap serialized data in a versioned header, compressing it above CACHE_COMPRESS_MIN_BYTES."""
+    compression_id = _COMPRESSION_IDS[compression] if len(data) >= CACHE_COMPRESS_MIN_BYTES else COMPRESSION_NONE
+    if compression_id == COMPRESSION_ZSTD:
+        data = _zstd_compressor.compress(data)
+    elif compression_id == COMPRESSION_ZLIB:
+        data = zlib.compress(data, CACHE_ZLIB_LEVEL)
+    return CACHE_MAGIC + bytes((CACHE_SCHEMA_VERSION, compression_id)) + data
+
+
+def decode_payload(blob: bytes | str) -> bytes | None:
+    """
+    Unwrap a cached value written by encode_payload.
+
+    Returns None for values written before the codec existed, by another schema
+    version, or that fail to decompress, so callers treat them as cache misses.
+    """
+    if not isinstance(blob, bytes) or len(blob) < HEADER_SIZE or not blob.startswith(CACHE_MAGIC):
+        return None
+    version, compression_id = blob[2], blob[3]
+    if version != CACHE_SCHEMA_VERSION:
+        return None
+    data = blob[HEADER_SIZE:]
+    try:
+        if compression_id == COMPRESSION_ZSTD:
+            return _zstd_decompressor.decompress(data)
+        if compression_id == COMPRESSION_ZLIB:
+            return zlib.decompress(data)
+        if compression_id == COMPRESSION_NONE:
+            return data
+    except (zstandard.ZstdError, zlib.error) as e:
+        logger.warning("Discarding undecodable cache value: %s", e)
+        return None
+    return None
@@ -0,0 +1,48 @@
+import hashlib
+import os
+
+
+def prompt_version(prompt: str) -> str:
+    """Return a short, stable hash identifying a prompt text."""
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:12]
+
+
+def transcript_cache_key(video_id: str, language: str) -> str:
+    """Build the Redis key for a video transcript."""
+    return f"transcript:{video_id}:{language}"
+
+
+def preprocessed_transcript_cache_key(video_id: str, language: str, settings: str) -> str:
+    """Build the Redis key for a preprocessed transcript, versioned by the preprocessing settings."""
+    return f"transcript_preprocessed:{video_id}:{language}:{prompt_version(settings)}"
+
+
+def summary_cache_key(video_id: str, language: str) -> str:
+    """Build the Redis key for a video summary, versioned by SUMMARY_PROMPT."""
+    version = prompt_version(os.getenv("SUMMARY_PROMPT") or "")
+    return f"summary:{video_id}:{language}:{version}"
+
+
+def summary_chunk_cache_key(chunk: str, prompt: str) -> str:
+    """Build the Redis key for a partial summary, addressed by chunk content."""
+    content_hash = hashlib.sha256(chunk.encode("utf-8")).hexdigest()
+    return f"summary_chunk:{content_hash}:{prompt_version(prompt)}"
+
+
+def quiz_cache_key(video_id: str, language: str, num_questions: int) -> str:
+    """Build the Redis key for a video quiz, versioned by QUIZ_PROMPT."""
+    version = prompt_version(os.getenv("QUIZ_PROMPT") or "")
+    return f"quiz:{video_id}:{language}:{num_questions}:{version}"
+
+
+def quiz_pool_cache_key(video_id: str, language: str) -> str:
+    """Build the Redis key for the pool of generated questions of a video, versioned by QUIZ_PROMPT."""
+    version = prompt_version(os.getenv("QUIZ_PROMPT") or "")
+    return f"quiz_pool:{video_id}:{language}:{version}"
+
+
+def learning_pack_cache_key(video_id: str, language: str, num_questions: int) -> str:
+    """Build the Redis key for a combined summary + quiz pack, versioned by both prompts."""
+    summary_version = prompt_version(os.getenv("SUMMARY_PROMPT") or "")
+    quiz_version = prompt_version(os.getenv("QUIZ_PROMPT") or "")
+    return f"learning_pack:{video_id}:{language}:{num_questions}:{summary_version}:{quiz_version}"
@@ -0,0 +1,177 @@
+import asyncio
+import logging
+import os
+import random
+import time
+from collections import Counter, deque
+from contextlib import asynccontextmanager
+from collections.abc import AsyncIterator
+from app.services.redis_client import get_redis_client
+from app.utils.exceptions import ServiceOverloadedException
+
+logger = logging.getLogger(__name__)
+
+# KEYS[1] is the cooldown key, KEYS[2..n] are token buckets with ARGV triples
+# (capacity, refill per ms, cost). Takes from every bucket or from none, and
+# returns 0 on success or the milliseconds to wait before trying again.
+_TAKE_TOKENS_SCRIPT = """
+local cooldown = redis.call("PTTL", KEYS[1])
+if cooldown > 0 then
+    return cooldown
+end
+local t = redis.call("TIME")
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local levels = {}
+local wait = 0
+for i = 2, #KEYS do
+    local base = (i - 2) * 3
+    local capacity = tonumber(ARGV[base + 1])
+    local rate = tonumber(ARGV[base + 2])
+    local cost = math.min(tonumber(ARGV[base + 3]), capacity)
+    local state = redis.call("HMGET", KEYS[i], "tokens", "ts")
+    local tokens = tonumber(state[1]) or capacity
+    local ts = tonumber(state[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+    levels[i] = {tokens, cost, capacity, rate}
+    if tokens < cost then
+        wait = math.max(wait, math.ceil((cost - tokens) / rate))
+    end
+end
+for i = 2, #KEYS do
+    local tokens, cost, capacity, rate = unpack(levels[i])
+    if wait == 0 then
+        tokens = tokens - cost
+    end
+    redis.call("HSET", KEYS[i], "tokens", tostring(tokens), "ts", now)
+    redis.call("PEXPIRE", KEYS[i], math.ceil(capacity / rate) + 1000)
+end
+return wait
+"""
+
+
+class UpstreamGovernor:
+    """
+    Limit calls to one upstream API.
+
+    Requests-per-minute and tokens-per-minute budgets are token buckets in Redis,
+    shared by every worker. Concurrency is limited per worker with an AIMD limit
+    that halves on 429 and grows back on success, and waiters are served in FIFO
+    order. When the queue is full or the budget wait would exceed max_wait, the
+    call is shed with a 503 and a Retry-After hint.
+    """
+
+    def __init__(self, name: str, rpm: int, tpm: int, max_concurrency: int, max_queue: int, max_wait: float):
+        self.name = name
+        self.rpm = rpm
+        self.tpm = tpm
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.stats: Counter = Counter()
+        self._limit = float(max_concurrency)
+        self._active = 0
+        self._waiters: deque[asyncio.Future] = deque()
+
+    @property
+    def limit(self) -> int:
+        return max(1, int(self._limit))
+
+    def snapshot(self) -> dict[str, int]:
+        """Return the current limit, load and counters of this worker."""
+        return {"limit": self.limit, "active": self._active, "queued": len(self._waiters), **self.stats}
+
+    @asynccontextmanager
+    async def acquire(self, tokens: int = 0) -> AsyncIterator[None]:
+        """Wait for a concurrency slot and for rate budget for one call of the given token cost."""
+        await self._enter()
+        try:
+            await self._take_budget(tokens)
+            yield
+        finally:
+            self._active -= 1
+            self._wake()
+
+    def record_success(self) -> None:
+        """Grow the concurrency limit additively after a successful call."""
+        self._limit = min(float(self.max_concurrency), self._limit + 1 / self._limit)
+        self._wake()
+
+    async def record_rate_limited(self, retry_after: float | None) -> None:
+        """Halve the concurrency limit and pause every worker for Retry-After seconds."""
+        self.stats["rate_limited"] += 1
+        self._limit = max(1.0, self._limit / 2)
+        if retry_after:
+            await get_redis_client().set(f"governor:{self.name}:cooldown", "1", px=int(retry_after * 1000))
+        logger.warning("%s rate limited, concurrency limit now %s", self.name, self.limit)
+
+    async def _enter(self) -> None:
+        if self._active < self.limit and not self._waiters:
+            self._active += 1
+            return
+        if len(self._waiters) >= self.max_queue:
+            self.stats["shed"] += 1
+            raise ServiceOverloadedException(f"{self.name} queue is full", retry_after=self.max_wait)
+        self.stats["queued"] += 1
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.max_wait)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if waiter.done() and not waiter.cancelled():
+                self._active -= 1
+                self._wake()
+            else:
+                waiter.cancel()
+                self._waiters.remove(waiter)
+            if isinstance(e, asyncio.TimeoutError):
+                self.stats["shed"] += 1
+                raise ServiceOverloadedException(f"Timed out waiting for {self.name}", retry_after=self.max_wait)
+            raise
+
+    def _wake(self) -> None:
+        while self._waiters and self._active < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._active += 1
+                waiter.set_result(None)
+
+    async def _take_budget(self, tokens: int) -> None:
+        keys, args = [f"governor:{self.name}:cooldown"], []
+        if self.rpm > 0:
+            keys.append(f"governor:{self.name}:rpm")
+            args += [self.rpm, self.rpm / 60000, 1]
+        if self.tpm > 0 and tokens > 0:
+            keys.append(f"governor:{self.name}:tpm")
+            args += [self.tpm, self.tpm / 60000, tokens]
+        deadline = time.monotonic() + self.max_wait
+        while True:
+            wait_ms = int(await get_redis_client().eval(_TAKE_TOKENS_SCRIPT, len(keys), *keys, *args))
+            if wait_ms <= 0:
+                return
+            wait = wait_ms / 1000
+            if time.monotonic() + wait > deadline:
+                self.stats["shed"] += 1
+                raise ServiceOverloadedException(f"{self.name} rate budget exhausted", retry_after=wait)
+            self.stats["throttled"] += 1
+            await asyncio.sleep(wait + random.uniform(0, 0.05))
+
+
+def _governor_from_env(name: str, rpm: int, tpm: int, max_concurrency: int) -> UpstreamGovernor:
+    prefix = f"GOVERNOR_{name.upper()}"
+    return UpstreamGovernor(
+        name,
+        rpm=int(os.getenv(f"{prefix}_RPM", str(rpm))),
+        tpm=int(os.getenv(f"{prefix}_TPM", str(tpm))),
+        max_concurrency=int(os.getenv(f"{prefix}_MAX_CONCURRENCY", str(max_concurrency))),
+        max_queue=int(os.getenv(f"{prefix}_MAX_QUEUE", "200")),
+        max_wait=float(os.getenv(f"{prefix}_MAX_WAIT", "30")),
+    )
+
+
+openai_governor = _governor_from_env("openai", rpm=500, tpm=200000, max_concurrency=16)
+rapidapi_governor = _governor_from_env("rapidapi", rpm=60, tpm=0, max_concurrency=8)
+
+
+def governor_stats() -> dict[str, dict[str, int]]:
+    """Return the state of every upstream governor in this worker."""
+    return {g.name: g.snapshot() for g in (openai_governor, rapidapi_governor)}
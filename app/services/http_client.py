@@ -0,0 +1,124 @@
+import asyncio
+import logging
+import os
+import random
+from contextlib import nullcontext
+import httpx
+from app.core.metrics import record_upstream_error
+from app.services.governor import UpstreamGovernor
+
+logger = logging.getLogger(__name__)
+
+TRANSCRIPT_API_BASE_URL = os.getenv("TRANSCRIPT_API_BASE_URL", "https://youtube-transcript3.p.rapidapi.com")
+TRANSCRIPT_API_HOST = "youtube-transcript3.p.rapidapi.com"
+
+TRANSCRIPT_HTTP2 = os.getenv("TRANSCRIPT_HTTP2", "true").lower() == "true"
+TRANSCRIPT_MAX_CONNECTIONS = int(os.getenv("TRANSCRIPT_MAX_CONNECTIONS", "50"))
+TRANSCRIPT_MAX_KEEPALIVE = int(os.getenv("TRANSCRIPT_MAX_KEEPALIVE", "20"))
+TRANSCRIPT_KEEPALIVE_EXPIRY = float(os.getenv("TRANSCRIPT_KEEPALIVE_EXPIRY", "30"))
+TRANSCRIPT_CONNECT_TIMEOUT = float(os.getenv("TRANSCRIPT_CONNECT_TIMEOUT", "5"))
+TRANSCRIPT_READ_TIMEOUT = float(os.getenv("TRANSCRIPT_READ_TIMEOUT", "30"))
+TRANSCRIPT_POOL_TIMEOUT = float(os.getenv("TRANSCRIPT_POOL_TIMEOUT", "10"))
+TRANSCRIPT_MAX_RETRIES = int(os.getenv("TRANSCRIPT_MAX_RETRIES", "3"))
+TRANSCRIPT_BACKOFF_BASE = float(os.getenv("TRANSCRIPT_BACKOFF_BASE", "0.5"))
+TRANSCRIPT_BACKOFF_MAX = float(os.getenv("TRANSCRIPT_BACKOFF_MAX", "8"))
+
+WEBHOOK_TIMEOUT = float(os.getenv("WEBHOOK_TIMEOUT", "10"))
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+_transcript_client: httpx.AsyncClient | None = None
+_webhook_client: httpx.AsyncClient | None = None
+
+
+def get_transcript_http_client() -> httpx.AsyncClient:
+    """Return the shared, pooled HTTP client for the transcript provider."""
+    global _transcript_client
+    if _transcript_client is None or _transcript_client.is_closed:
+        _transcript_client = httpx.AsyncClient(
+            base_url=TRANSCRIPT_API_BASE_URL,
+            headers={"x-rapidapi-host": TRANSCRIPT_API_HOST},
+            http2=TRANSCRIPT_HTTP2,
+            limits=httpx.Limits(
+                max_connections=TRANSCRIPT_MAX_CONNECTIONS,
+                max_keepalive_connections=TRANSCRIPT_MAX_KEEPALIVE,
+                keepalive_expiry=TRANSCRIPT_KEEPALIVE_EXPIRY,
+            ),
+            timeout=httpx.Timeout(
+                TRANSCRIPT_READ_TIMEOUT,
+                connect=TRANSCRIPT_CONNECT_TIMEOUT,
+                pool=TRANSCRIPT_POOL_TIMEOUT,
+            ),
+        )
+    return _transcript_client
+
+
+def get_webhook_http_client() -> httpx.AsyncClient:
+    """Return the shared HTTP client used to deliver job webhooks."""
+    global _webhook_client
+    if _webhook_client is None or _webhook_client.is_closed:
+        _webhook_client = httpx.AsyncClient(timeout=WEBHOOK_TIMEOUT)
+    return _webhook_client
+
+
+async def close_http_clients() -> None:
+    """Close the shared HTTP clients. Called from the app lifespan on shutdown."""
+    global _transcript_client, _webhook_client
+    if _transcript_client is not None:
+        await _transcript_client.aclose()
+        _transcript_client = None
+    if _webhook_client is not None:
+        await _webhook_client.aclose()
+        _webhook_client = None
+
+
+def _retry_delay(attempt: int, response: httpx.Response | None) -> float:
+    """Compute the wait before the next attempt, honouring Retry-After when present."""
+    if response is not None:
+        retry_after = parse_retry_after(response)
+        if retry_after is not None:
+            return min(retry_after, TRANSCRIPT_BACKOFF_MAX)
+    # Full jitter: spread retries from many workers over the backoff window.
+    return random.uniform(0, min(TRANSCRIPT_BACKOFF_MAX, TRANSCRIPT_BACKOFF_BASE * 2 ** attempt))
+
+
+def parse_retry_after(response: httpx.Response) -> float | None:
+    """Return the Retry-After header of a response in seconds, if given as a number."""
+    retry_after = response.headers.get("Retry-After")
+    return float(retry_after) if retry_after and retry_after.isdigit() else None
+
+
+async def get_with_retries(
+    client: httpx.AsyncClient,
+    url: str,
+    governor: UpstreamGovernor | None = None,
+    **kwargs,
+) -> httpx.Response:
+    """
+    GET a URL, retrying with jittered backoff on 429/5xx and transport errors.
+
+    When a governor is given, every attempt waits for its rate budget and
+    reports 429s to it.
+    """
+    attempt = 0
+    while True:
+        response = None
+        try:
+            async with governor.acquire() if governor else nullcontext():
+                response = await client.get(url, **kwargs)
+            if response.status_code >= 400:
+                record_upstream_error("rapidapi", response.status_code)
+            if governor and response.status_code == 429:
+                await governor.record_rate_limited(parse_retry_after(response))
+            elif governor and response.status_code < 400:
+                governor.record_success()
+            if response.status_code not in RETRYABLE_STATUS_CODES or attempt >= TRANSCRIPT_MAX_RETRIES:
+                return response
+            logger.warning("Transcript API returned %s, retrying (attempt %s)", response.status_code, attempt + 1)
+        except httpx.TransportError as e:
+            record_upstream_error("rapidapi", "transport")
+            if attempt >= TRANSCRIPT_MAX_RETRIES:
+                raise
+            logger.warning("Transcript API transport error: %s, retrying (attempt %s)", e, attempt + 1)
+        await asyncio.sleep(_retry_delay(attempt, response))
+        attempt += 1
@@ -0,0 +1,259 @@
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+import httpx
+from redis.exceptions import RedisError, ResponseError
+from app.schemas.jobs import Job, JobError, JobRequest
+from app.services.cache import cache_get
+from app.services.cache_keys import summary_cache_key, quiz_cache_key
+from app.services.http_client import get_webhook_http_client
+from app.services.quiz import generate_quiz_from_youtube
+from app.services.redis_client import get_redis_client, get_blocking_redis_client
+from app.services.summary import generate_summary_from_youtube
+from app.services.youtube import extract_youtube_id
+from app.utils.exceptions import APIException
+from app.utils.validators import (
+    validate_youtube_url,
+    validate_language,
+    validate_num_questions,
+    validate_webhook_url,
+    is_public_address,
+    WEBHOOK_ALLOWED_HOSTS,
+)
+
+JOBS_STREAM = os.getenv("JOBS_STREAM", "jobs:stream")
+JOBS_GROUP = os.getenv("JOBS_GROUP", "generation-workers")
+JOB_TTL = int(os.getenv("JOB_TTL", str(24 * 60 * 60)))
+JOB_WORKER_CONCURRENCY = int(os.getenv("JOB_WORKER_CONCURRENCY", "4"))
+JOB_CLAIM_IDLE_MS = int(os.getenv("JOB_CLAIM_IDLE_MS", str(5 * 60 * 1000)))
+JOB_STREAM_MAXLEN = int(os.getenv("JOB_STREAM_MAXLEN", "100000"))
+JOB_WORKER_MAX_BACKOFF = float(os.getenv("JOB_WORKER_MAX_BACKOFF", "30"))
+JOB_READ_BLOCK_MS = int(os.getenv("JOB_READ_BLOCK_MS", "5000"))
+
+logger = logging.getLogger(__name__)
+
+
+def _job_key(job_id: str) -> str:
+    return f"job:{job_id}"
+
+
+def _job_cache_key(kind: str, video_id: str, language: str, num_questions: int) -> str:
+    """Return the result cache key a job writes to, which also deduplicates jobs."""
+    if kind == "summary":
+        return summary_cache_key(video_id, language)
+    return quiz_cache_key(video_id, language, num_questions)
+
+
+async def get_job(job_id: str) -> Job | None:
+    """Return a job by ID, or None if unknown or expired."""
+    stored = await get_redis_client().get(_job_key(job_id))
+    if not stored:
+        return None
+    return Job.model_validate_json(stored)
+
+
+async def _save_job(job: Job) -> None:
+    job.updated_at = time.time()
+    await get_redis_client().set(_job_key(job.job_id), job.model_dump_json(), ex=JOB_TTL)
+
+
+async def submit_job(request: JobRequest) -> Job:
+    """
+    Queue a summary or quiz generation and return its job.
+
+    A result that is already cached completes the job immediately. A job for a
+    cache key that another queued or running job already covers returns that job.
+    """
+    youtube_url = validate_youtube_url(request.youtube_url)
+    language = validate_language(request.language)
+    num_questions = validate_num_questions(request.num_questions)
+    webhook_url = validate_webhook_url(str(request.webhook_url)) if request.webhook_url else None
+    cache_key = _job_cache_key(request.kind, extract_youtube_id(youtube_url), language, num_questions)
+    now = time.time()
+    job = Job(
+        job_id=uuid.uuid4().hex,
+        status="queued",
+        kind=request.kind,
+        youtube_url=youtube_url,
+        language=language,
+        num_questions=num_questions,
+        webhook_url=webhook_url,
+        created_at=now,
+        updated_at=now,
+    )
+    cached = await cache_get(request.kind, cache_key)
+    if cached is not None:
+        job.status = "completed"
+        job.result = cached
+        await _save_job(job)
+        return job
+    # The record is written before the dedup key points at it, so a concurrent
+    # submitter that finds the key never returns a job that cannot be fetched yet.
+    await _save_job(job)
+    dedup_key = f"job:dedup:{cache_key}"
+    if not await get_redis_client().set(dedup_key, job.job_id, nx=True, ex=JOB_TTL):
+        existing_id = await get_redis_client().get(dedup_key)
+        existing = await get_job(existing_id.decode("utf-8")) if existing_id else None
+        if existing is not None and existing.status in ("queued", "running"):
+            await get_redis_client().delete(_job_key(job.job_id))
+            logger.info("Job deduplicated onto %s", existing.job_id)
+            return existing
+        await get_redis_client().set(dedup_key, job.job_id, ex=JOB_TTL)
+    await get_redis_client().xadd(JOBS_STREAM, {"job_id": job.job_id}, maxlen=JOB_STREAM_MAXLEN, approximate=True)
+    logger.info("Job %s queued: %s for %s", job.job_id, request.kind, youtube_url)
+    return job
+
+
+async def _resolve_public_address(url: httpx.URL) -> str | None:
+    """Return an address the URL's host resolves to, or None unless every one of them is public."""
+    port = url.port or (443 if url.scheme == "https" else 80)
+    infos = await asyncio.get_running_loop().getaddrinfo(url.host, port, type=socket.SOCK_STREAM)
+    addresses = [info[4][0] for info in infos]
+    if not addresses or not all(is_public_address(address) for address in addresses):
+        return None
+    return addresses[0]
+
+
+async def _notify_webhook(job: Job) -> None:
+    """POST the finished job to its webhook. Failures are logged, not retried."""
+    try:
+        validate_webhook_url(job.webhook_url)
+        url = httpx.URL(job.webhook_url)
+        headers = {"Content-Type": "application/json"}
+        extensions = {}
+        if not WEBHOOK_ALLOWED_HOSTS:
+            address = await _resolve_public_address(url)
+            if address is None:
+                logger.warning("Webhook for job %s not sent: its host resolves to a non-public address", job.job_id)
+                return
+            # Connect to the address that was checked rather than resolving the host again,
+            # which a DNS-rebinding host could answer with an internal address. The Host
+            # header and TLS server name (and so certificate verification) keep the hostname.
+            headers["Host"] = url.netloc.decode("ascii")
+            extensions["sni_hostname"] = url.host
+            url = url.copy_with(host=address)
+        response = await get_webhook_http_client().post(
+            url,
+            content=job.model_dump_json(exclude={"webhook_url"}),
+            headers=headers,
+            extensions=extensions,
+        )
+        response.raise_for_status()
+    except Exception as e:
+        logger.warning("Webhook for job %s failed: %s", job.job_id, e)
+
+
+async def process_job(job_id: str) -> None:
+    """Run one job through the regular generation services and record the outcome."""
+    job = await get_job(job_id)
+    if job is None or job.status == "completed":
+        return
+    job.status = "running"
+    await _save_job(job)
+    try:
+        if job.kind == "summary":
+            job.result = await generate_summary_from_youtube(job.youtube_url, job.language)
+        else:
+            job.result = await generate_quiz_from_youtube(job.youtube_url, job.language, job.num_questions)
+        job.status = "completed"
+    except APIException as e:
+        job.status = "failed"
+        job.error = JobError(status_code=e.status_code, detail=e.detail)
+    except Exception as e:
+        logger.error("Unexpected error in job %s: %s", job_id, e)
+        job.status = "failed"
+        job.error = JobError(status_code=500, detail="An unexpected error occurred while processing the job")
+    await _save_job(job)
+    logger.info("Job %s %s", job_id, job.status)
+    if job.webhook_url:
+        await _notify_webhook(job)
+
+
+async def _ensure_consumer_group() -> None:
+    try:
+        await get_redis_client().xgroup_create(JOBS_STREAM, JOBS_GROUP, id="0", mkstream=True)
+    except ResponseError as e:
+        if "BUSYGROUP" not in str(e):
+            raise
+
+
+async def _read_new_messages(consumer: str, count: int) -> list:
+    """
+    Wait up to JOB_READ_BLOCK_MS for new messages for this consumer.
+
+    Reads on the blocking client, whose connections have no read timeout, so an idle
+    wait longer than REDIS_SOCKET_TIMEOUT is not reported as a Redis error.
+    """
+    response = await get_blocking_redis_client().xreadgroup(
+        JOBS_GROUP, consumer, {JOBS_STREAM: ">"}, count=count, block=JOB_READ_BLOCK_MS
+    )
+    return [message for _, stream_messages in response or [] for message in stream_messages]
+
+
+async def run_worker(concurrency: int = JOB_WORKER_CONCURRENCY, consumer: str | None = None) -> None:
+    """
+    Consume jobs from the Redis stream, running up to concurrency at a time.
+
+    Messages left pending by a crashed worker for longer than JOB_CLAIM_IDLE_MS
+    are claimed and run again. Redis errors release the slots and are retried with
+    exponential backoff, so the worker outlives Redis restarts.
+    """
+    consumer = consumer or f"{socket.gethostname()}-{os.getpid()}"
+    logger.info("Job worker %s started with concurrency %s", consumer, concurrency)
+    slots = asyncio.Semaphore(concurrency)
+    running: set[asyncio.Task] = set()
+
+    async def handle(message_id: bytes, fields: dict) -> None:
+        try:
+            # Claimed messages whose entry was trimmed from the stream come without fields.
+            if fields and b"job_id" in fields:
+                await process_job(fields[b"job_id"].decode("utf-8"))
+            await get_redis_client().xack(JOBS_STREAM, JOBS_GROUP, message_id)
+        except RedisError as e:
+            # Left pending, so it is claimed and run again after JOB_CLAIM_IDLE_MS.
+            logger.warning("Could not finish job message %s: %s", message_id, e)
+        finally:
+            slots.release()
+
+    delay = 1.0
+    group_ready = False
+    try:
+        while True:
+            await slots.acquire()
+            free = 1
+            while not slots.locked():
+                await slots.acquire()
+                free += 1
+            try:
+                if not group_ready:
+                    await _ensure_consumer_group()
+                    group_ready = True
+                # Redis 6.2 replies with two elements and Redis 7 adds deleted IDs as a third.
+                claimed = (await get_redis_client().xautoclaim(
+                    JOBS_STREAM, JOBS_GROUP, consumer, JOB_CLAIM_IDLE_MS, start_id="0-0", count=free
+                ))[1]
+                messages = list(claimed)
+                if len(messages) < free:
+                    messages.extend(await _read_new_messages(consumer, free - len(messages)))
+            except RedisError as e:
+                # The group is recreated in case Redis lost the stream.
+                group_ready = False
+                for _ in range(free):
+                    slots.release()
+                logger.warning("Job worker could not read the stream, retrying in %.0fs: %s", delay, e)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, JOB_WORKER_MAX_BACKOFF)
+                continue
+            delay = 1.0
+            for message_id, fields in messages:
+                task = asyncio.create_task(handle(message_id, fields))
+                running.add(task)
+                task.add_done_callback(running.discard)
+            for _ in range(free - len(messages)):
+                slots.release()
+    finally:
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
@@ -0,0 +1,71 @@
+import asyncio
+import logging
+from app.schemas.learning_pack import LearningPackResponse
+from app.services.cache_keys import learning_pack_cache_key, summary_cache_key, quiz_cache_key
+from app.services.cache import cache_get, cache_mget, cache_set
+from app.services.quiz import quiz_from_pool
+from app.services.singleflight import single_flight
+from app.services.summary import generate_summary_from_youtube
+from app.services.youtube import extract_youtube_id
+from app.services.transcript_preprocessing import get_preprocessed_transcript
+from app.utils.exceptions import APIException, TranscriptException, ServiceOverloadedException
+from app.core.logging import SAMPLED
+
+
+async def generate_learning_pack_from_youtube(youtube_url: str, language: str = "en", num_questions: int = 5) -> LearningPackResponse:
+    """Generate the summary and the quiz of a YouTube video from a single transcript fetch."""
+    logger = logging.getLogger(__name__)
+    video_id = extract_youtube_id(youtube_url)
+    cache_key = learning_pack_cache_key(video_id, language, num_questions)
+    generate = lambda: single_flight(
+        cache_key,
+        lambda: _generate_learning_pack(youtube_url, video_id, language, num_questions, cache_key),
+        lambda: cache_get("learning_pack", cache_key),
+    )
+    cached = await cache_get("learning_pack", cache_key, refresh=generate)
+    if cached is not None:
+        logger.info("Learning pack fetched from Redis cache", extra=SAMPLED)
+        return cached
+    return await generate()
+
+
+async def _generate_learning_pack(youtube_url: str, video_id: str, language: str, num_questions: int, cache_key: str) -> LearningPackResponse:
+    """Fetch the transcript at most once and run whichever generations are not cached yet, concurrently."""
+    logger = logging.getLogger(__name__)
+    summary_key = summary_cache_key(video_id, language)
+    quiz_key = quiz_cache_key(video_id, language, num_questions)
+    try:
+        summary, quiz = await cache_mget([("summary", summary_key), ("quiz", quiz_key)])
+        if summary is None or quiz is None:
+            generations = {}
+            if summary is None:
+                logger.info("Fetching transcript for URL: %s", youtube_url)
+                # Fetched up front so the summary and quiz generations share it from the cache.
+                await get_preprocessed_transcript(youtube_url, language)
+                # Goes through the summary's single flight, so a concurrent /summary/ request
+                # for this video shares the generation instead of making a second one.
+                generations["summary"] = generate_summary_from_youtube(youtube_url, language)
+            if quiz is None:
+                # The quiz pool only loads the transcript when it has to generate, which is then a cache hit.
+                generations["quiz"] = quiz_from_pool(
+                    video_id, language, num_questions, lambda: get_preprocessed_transcript(youtube_url, language)
+                )
+            results = dict(zip(generations, await asyncio.gather(*generations.values())))
+            summary = results.get("summary", summary)
+            if "quiz" in results:
+                quiz = results["quiz"]
+                await cache_set("quiz", quiz_key, quiz)
+        pack = LearningPackResponse(summary=summary, quiz=quiz)
+        logger.info("Learning pack generated for URL: %s", youtube_url)
+        await cache_set("learning_pack", cache_key, pack)
+        return pack
+    except ServiceOverloadedException:
+        raise
+    except TranscriptException as e:
+        logger.error("TranscriptException: %s", e)
+        raise APIException(status_code=503, detail=str(e))
+    except APIException:
+        raise
+    except Exception as e:
+        logger.error("Failed to generate learning pack: %s", e)
+        raise APIException(status_code=500, detail="An unexpected error occurred while generating the learning pack")
@@ -0,0 +1,64 @@
+import time
+from collections import Counter, OrderedDict
+from typing import Any
+
+
+class LocalCache:
+    """In-process LRU cache bounded by entry count and total bytes, with a per-entry TTL."""
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl: float):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.total_bytes = 0
+        self.stats: Counter = Counter()
+        self._entries: OrderedDict[str, tuple[Any, int, float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Any | None:
+        """Return the value for a key, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats["misses"] += 1
+            return None
+        value, _, expires_at = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            self.stats["expirations"] += 1
+            self.stats["misses"] += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats["hits"] += 1
+        return value
+
+    def set(self, key: str, value: Any, size: int, ttl: float | None = None) -> None:
+        """Store a value, evicting least recently used entries to stay within the bounds."""
+        if size > self.max_bytes:
+            self.invalidate(key)
+            return
+        if key in self._entries:
+            self._remove(key)
+        expires_at = time.monotonic() + min(self.ttl, ttl if ttl is not None else self.ttl)
+        self._entries[key] = (value, size, expires_at)
+        self.total_bytes += size
+        while len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.stats["evictions"] += 1
+
+    def invalidate(self, key: str) -> None:
+        """Drop a key if present."""
+        if key in self._entries:
+            self._remove(key)
+            self.stats["invalidations"] += 1
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._entries.clear()
+        self.total_bytes = 0
+
+    def _remove(self, key: str) -> None:
+        _, size, _ = self._entries.pop(key)
+        self.total_bytes -= size
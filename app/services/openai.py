@@ -1,6 +1,109 @@
 import os
-from openai import AsyncOpenAI
+from collections.abc import AsyncIterator
+from contextlib import AsyncExitStack
+import httpx
+from openai import APIConnectionError, APIStatusError, AsyncOpenAI, DefaultAsyncHttpxClient, RateLimitError
+from app.core.metrics import time_stage, record_openai_usage, record_upstream_error
+from app.services.governor import openai_governor
+from app.utils.exceptions import ServiceOverloadedException
+from app.utils.tokens import count_tokens
 
-async_client = AsyncOpenAI(
-    api_key=os.environ.get("OPENAI_API_KEY")
-)
\ No newline at end of file
+OPENAI_OUTPUT_TOKENS_ESTIMATE = int(os.getenv("OPENAI_OUTPUT_TOKENS_ESTIMATE", "1000"))
+OPENAI_MAX_CONNECTIONS = int(os.getenv("OPENAI_MAX_CONNECTIONS", "100"))
+OPENAI_MAX_KEEPALIVE = int(os.getenv("OPENAI_MAX_KEEPALIVE", "20"))
+
+_openai_client: AsyncOpenAI | None = None
+
+
+def get_openai_client() -> AsyncOpenAI:
+    """Return the shared OpenAI client, creating it on first use."""
+    global _openai_client
+    if _openai_client is None:
+        _openai_client = AsyncOpenAI(
+            api_key=os.environ.get("OPENAI_API_KEY"),
+            http_client=DefaultAsyncHttpxClient(
+                limits=httpx.Limits(max_connections=OPENAI_MAX_CONNECTIONS, max_keepalive_connections=OPENAI_MAX_KEEPALIVE)
+            ),
+        )
+    return _openai_client
+
+
+def set_openai_client(client: AsyncOpenAI | None) -> None:
+    """Replace the shared OpenAI client, for example with a stub in offline tests."""
+    global _openai_client
+    _openai_client = client
+
+
+async def close_openai_client() -> None:
+    """Close the shared OpenAI client. Called from the app lifespan on shutdown."""
+    global _openai_client
+    if _openai_client is not None:
+        await _openai_client.close()
+        _openai_client = None
+
+
+def _retry_after(response: httpx.Response | None) -> float | None:
+    """Read the Retry-After hint of a 429 response, in seconds."""
+    if response is None:
+        return None
+    if response.headers.get("retry-after-ms"):
+        return float(response.headers["retry-after-ms"]) / 1000
+    retry_after = response.headers.get("retry-after")
+    return float(retry_after) if retry_after and retry_after.replace(".", "", 1).isdigit() else None
+
+
+async def _release_after_stream(stream, slot: AsyncExitStack) -> AsyncIterator:
+    """Yield the events of a streamed response, holding its governor slot until it ends or is closed."""
+    try:
+        async for event in stream:
+            yield event
+    finally:
+        try:
+            await stream.close()
+        finally:
+            await slot.aclose()
+
+
+async def create_response(client: AsyncOpenAI | None = None, **kwargs):
+    """
+    Call the Responses API through the shared OpenAI governor.
+
+    The call is charged against the requests- and tokens-per-minute budgets, with its
+    token cost estimated from the prompt plus OPENAI_OUTPUT_TOKENS_ESTIMATE. A 429
+    backs the governor off and is raised as ServiceOverloadedException.
+
+    With stream=True an async iterator of events is returned instead, which keeps the
+    governor's concurrency slot until it is exhausted or closed with aclose().
+    """
+    client = client or get_openai_client()
+    tokens = (
+        count_tokens(kwargs.get("instructions") or "")
+        + count_tokens(str(kwargs.get("input") or ""))
+        + OPENAI_OUTPUT_TOKENS_ESTIMATE
+    )
+    slot = AsyncExitStack()
+    await slot.enter_async_context(openai_governor.acquire(tokens))
+    try:
+        try:
+            with time_stage("openai"):
+                response = await client.responses.create(**kwargs)
+        except RateLimitError as e:
+            record_upstream_error("openai", 429)
+            retry_after = _retry_after(e.response)
+            await openai_governor.record_rate_limited(retry_after)
+            raise ServiceOverloadedException("OpenAI rate limit reached", retry_after=retry_after or 1)
+        except APIStatusError as e:
+            record_upstream_error("openai", e.status_code)
+            raise
+        except APIConnectionError:
+            record_upstream_error("openai", "connection")
+            raise
+    except BaseException:
+        await slot.aclose()
+        raise
+    openai_governor.record_success()
+    if kwargs.get("stream"):
+        return _release_after_stream(response, slot)
+    await slot.aclose()
+    record_openai_usage(response.usage)
+    return response
@@ -1,60 +1,262 @@
+import hashlib
 import logging
-from app.schemas.quiz import QuizQuestion, QuizAnswer
-from app.services.youtube import get_transcript_from_youtube
-from app.services.openai import async_client
-from app.utils.exceptions import APIException, TranscriptException
+import random
+from typing import Awaitable, Callable
+from pydantic import TypeAdapter, ValidationError
+from app.schemas.quiz import QuizQuestion, QuizEnvelope
+from app.services.youtube import extract_youtube_id
+from app.services.transcript_preprocessing import get_preprocessed_transcript
+from app.services.openai import create_response
+from app.utils.exceptions import APIException, TranscriptException, ServiceOverloadedException
 import os
 import json
 import re
-from app.services.redis_client import redis_client
+from app.services.cache import cache_get, cache_set
+from app.services.cache_keys import quiz_cache_key, quiz_pool_cache_key
+from app.services.singleflight import single_flight
+from app.services.similarity import cached_from_near_duplicate
+from app.core.logging import SAMPLED
+from app.core.metrics import time_stage
 
-async def build_quiz_prompt(language: str, num_questions: int) -> str:
-    """Build the prompt for quiz generation."""
+QUIZ_STRUCTURED_OUTPUT = os.getenv("QUIZ_STRUCTURED_OUTPUT", "true").lower() == "true"
+QUIZ_TOPUP_ATTEMPTS = int(os.getenv("QUIZ_TOPUP_ATTEMPTS", "1"))
+QUIZ_SHUFFLE_ANSWERS = os.getenv("QUIZ_SHUFFLE_ANSWERS", "false").lower() == "true"
+
+# Strict JSON schema mirroring QuizQuestion/QuizAnswer for the Responses API structured output.
+QUIZ_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "name": "quiz",
+    "strict": True,
+    "schema": {
+        "type": "object",
+        "properties": {
+            "questions": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "order": {"type": "integer"},
+                        "question": {"type": "string"},
+                        "type": {"type": "string"},
+                        "answers": {
+                            "type": "array",
+                            "items": {
+                                "type": "object",
+                                "properties": {
+                                    "answer": {"type": "string"},
+                                    "is_correct": {"type": "boolean"},
+                                },
+                                "required": ["answer", "is_correct"],
+                                "additionalProperties": False,
+                            },
+                        },
+                    },
+                    "required": ["order", "question", "type", "answers"],
+                    "additionalProperties": False,
+                },
+            },
+        },
+        "required": ["questions"],
+        "additionalProperties": False,
+    },
+}
+
+_question_adapter = TypeAdapter(QuizQuestion)
+_question_list_adapter = TypeAdapter(list[QuizQuestion])
+_quiz_envelope_adapter = TypeAdapter(QuizEnvelope)
+
+async def build_quiz_prompt(language: str, num_questions: int, existing: list[QuizQuestion] | None = None) -> str:
+    """Build the prompt for quiz generation, asking to avoid any existing questions."""
     base_prompt = os.getenv("QUIZ_PROMPT") or ""
     prompt_lang = f"Create the quiz in {language} (IMPORTANT). " if language else ""
-    return f"{prompt_lang}{base_prompt} Create {num_questions} questions."
+    prompt = f"{prompt_lang}{base_prompt} Create {num_questions} questions."
+    if existing:
+        listed = "\n".join(f"- {q.question}" for q in existing)
+        prompt += f" Do not repeat or rephrase any of these existing questions:\n{listed}"
+    return prompt
+
+def salvage_quiz_questions(raw: str) -> list[QuizQuestion]:
+    """
+    Recover the complete, valid questions from malformed or truncated quiz output.
+
+    Decodes the question objects of the first JSON array one at a time, skipping
+    invalid ones and stopping at the first incomplete one.
+    """
+    start = raw.find("[")
+    if start == -1:
+        return []
+    decoder = json.JSONDecoder()
+    questions, index = [], start + 1
+    while True:
+        while index < len(raw) and raw[index] in " \t\r\n,":
+            index += 1
+        if index >= len(raw) or raw[index] == "]":
+            break
+        try:
+            item, index = decoder.raw_decode(raw, index)
+        except json.JSONDecodeError:
+            break
+        try:
+            questions.append(_question_adapter.validate_python(item))
+        except ValidationError:
+            continue
+    return questions
 
 async def parse_quiz_response(response_text: str) -> list[QuizQuestion]:
-    """Parse the quiz response from the OpenAI API."""
+    """Parse the quiz response from the OpenAI API, salvaging what it can from malformed output."""
     raw = response_text.strip()
     raw = re.sub(r'^```json|^```|```$', '', raw, flags=re.MULTILINE).strip()
-    quiz_data = json.loads(raw)
-    if isinstance(quiz_data, dict) and 'questions' in quiz_data:
-        quiz_data = quiz_data['questions']
-    return [
-        QuizQuestion(
-            order=q.get('order'),
-            question=q.get('question'),
-            type=q.get('type'),
-            answers=[QuizAnswer(**a) for a in q.get('answers', [])]
-        ) for q in quiz_data
-    ]
+    try:
+        return _quiz_envelope_adapter.validate_json(raw).questions
+    except ValidationError:
+        pass
+    try:
+        return _question_list_adapter.validate_json(raw)
+    except ValidationError:
+        pass
+    questions = salvage_quiz_questions(raw)
+    logging.getLogger(__name__).warning("Malformed quiz output, salvaged %s questions", len(questions))
+    return questions
+
+async def _request_quiz_questions(
+    transcript: str, language: str, num_questions: int, existing: list[QuizQuestion] | None = None
+) -> list[QuizQuestion]:
+    prompt = await build_quiz_prompt(language, num_questions, existing)
+    kwargs = {"text": {"format": QUIZ_RESPONSE_FORMAT}} if QUIZ_STRUCTURED_OUTPUT else {}
+    response = await create_response(
+        model="gpt-4o-mini",
+        instructions=prompt,
+        input=transcript,
+        **kwargs
+    )
+    with time_stage("quiz_parse"):
+        return await parse_quiz_response(response.output_text)
+
+async def generate_quiz_from_transcript(
+    transcript: str, language: str, num_questions: int, existing: list[QuizQuestion] | None = None
+) -> list[QuizQuestion]:
+    """
+    Generate quiz questions from an already fetched transcript.
+
+    When the output is short of num_questions (for example truncated), only the missing
+    questions are requested again, up to QUIZ_TOPUP_ATTEMPTS times. Questions in existing
+    are avoided and not included in the result.
+    """
+    logger = logging.getLogger(__name__)
+    questions = await _request_quiz_questions(transcript, language, num_questions, existing)
+    for _ in range(QUIZ_TOPUP_ATTEMPTS):
+        missing = num_questions - len(questions)
+        if missing <= 0:
+            break
+        logger.info("Quiz output is %s questions short, requesting only those", missing)
+        questions += await _request_quiz_questions(transcript, language, missing, (existing or []) + questions)
+    if not questions:
+        raise ValueError("The quiz output contained no valid questions")
+    offset = len(existing or [])
+    return [q.model_copy(update={"order": offset + i + 1}) for i, q in enumerate(questions[:num_questions])]
+
+def shuffle_answers(question: QuizQuestion, seed: str) -> QuizQuestion:
+    """Shuffle the answers of a question in a stable order derived from seed and the question text."""
+    digest = hashlib.sha256(f"{seed}:{question.question}".encode("utf-8")).digest()
+    answers = list(question.answers)
+    random.Random(digest).shuffle(answers)
+    return question.model_copy(update={"answers": answers})
+
+def select_quiz_questions(pool: list[QuizQuestion], num_questions: int, seed: str) -> list[QuizQuestion]:
+    """Take the first num_questions of a pool, numbered from 1 and with shuffled answers if enabled."""
+    selected = [q.model_copy(update={"order": i + 1}) for i, q in enumerate(pool[:num_questions])]
+    if QUIZ_SHUFFLE_ANSWERS:
+        selected = [shuffle_answers(q, seed) for q in selected]
+    return selected
+
+async def _top_up_quiz_pool(
+    video_id: str, pool_key: str, language: str, num_questions: int, load_transcript: Callable[[], Awaitable[str]]
+) -> list[QuizQuestion]:
+    """
+    Generate the questions the pool is missing for num_questions and store the grown pool.
+
+    An empty pool starts from the pool of a near-duplicate video when there is one. A
+    pool pinned for longer than QUIZ_POOL_CACHE_TTL, for example by warmup.py, keeps its TTL.
+    """
+    logger = logging.getLogger(__name__)
+    pool = await cache_get("quiz_pool", pool_key) or []
+    if len(pool) >= num_questions:
+        return pool
+    transcript = await load_transcript()
+    if not pool:
+        pool = await cached_from_near_duplicate(
+            "quiz_pool", video_id, language, lambda duplicate_id: quiz_pool_cache_key(duplicate_id, language)
+        ) or []
+    missing = num_questions - len(pool)
+    if missing <= 0:
+        await cache_set("quiz_pool", pool_key, pool, keep_longer_ttl=True)
+        return pool
+    logger.info("Quiz pool %s has %s questions, generating %s more", pool_key, len(pool), missing)
+    pool = pool + await generate_quiz_from_transcript(transcript, language, missing, existing=pool)
+    await cache_set("quiz_pool", pool_key, pool, keep_longer_ttl=True)
+    return pool
+
+async def quiz_from_pool(
+    video_id: str, language: str, num_questions: int, load_transcript: Callable[[], Awaitable[str]]
+) -> list[QuizQuestion]:
+    """
+    Serve a quiz from the question pool of a video, generating only the questions it lacks.
+
+    The pool grows as larger quizzes are requested and the questions already in it are
+    passed to the model so new ones do not repeat them. load_transcript is only awaited
+    when questions have to be generated.
+    """
+    pool_key = quiz_pool_cache_key(video_id, language)
+
+    async def read_sufficient_pool() -> list[QuizQuestion] | None:
+        pool = await cache_get("quiz_pool", pool_key)
+        return pool if pool is not None and len(pool) >= num_questions else None
+
+    pool = await cache_get("quiz_pool", pool_key) or []
+    # A second round covers joining an in-flight top-up that was started for a smaller quiz.
+    for _ in range(2):
+        if len(pool) >= num_questions:
+            break
+        pool = await single_flight(
+            pool_key,
+            lambda: _top_up_quiz_pool(video_id, pool_key, language, num_questions, load_transcript),
+            read_sufficient_pool,
+        )
+    return select_quiz_questions(pool, num_questions, f"{video_id}:{language}")
 
 async def generate_quiz_from_youtube(youtube_url: str, language: str = "en", num_questions: int = 5) -> list[QuizQuestion]:
     """Generate a quiz from a YouTube video transcript."""
     logger = logging.getLogger(__name__)
-    cache_key = f"quiz:{youtube_url}:{language}:{num_questions}"
-    cached = await redis_client.get(cache_key)
-    if cached:
-        logger.info("Quiz fetched from Redis cache")
-        quiz_data = json.loads(cached.decode("utf-8") if isinstance(cached, bytes) else str(cached))
-        return [QuizQuestion(**q) for q in quiz_data]
+    cache_key = quiz_cache_key(extract_youtube_id(youtube_url), language, num_questions)
+    generate = lambda: single_flight(
+        cache_key,
+        lambda: _generate_quiz(youtube_url, language, num_questions, cache_key),
+        lambda: cache_get("quiz", cache_key),
+    )
+    cached = await cache_get("quiz", cache_key, refresh=generate)
+    if cached is not None:
+        logger.info("Quiz fetched from Redis cache", extra=SAMPLED)
+        return cached
+    return await generate()
+
+async def _generate_quiz(youtube_url: str, language: str, num_questions: int, cache_key: str) -> list[QuizQuestion]:
+    """Run the quiz generation and store the result in Redis."""
+    logger = logging.getLogger(__name__)
     try:
-        logger.info(f"Fetching transcript for URL: {youtube_url}")
-        transcript = await get_transcript_from_youtube(youtube_url, language)
-        prompt = await build_quiz_prompt(language, num_questions)
-        response = await async_client.responses.create(
-            model="gpt-4o-mini",
-            instructions=prompt,
-            input=transcript
+        quiz_questions = await quiz_from_pool(
+            extract_youtube_id(youtube_url),
+            language,
+            num_questions,
+            lambda: get_preprocessed_transcript(youtube_url, language),
         )
-        logger.info(f"Quiz generated for URL: {youtube_url} with {num_questions} questions")
-        quiz_questions = await parse_quiz_response(response.output_text)
-        await redis_client.setex(cache_key, 60 * 60, json.dumps([q.model_dump() for q in quiz_questions]))
+        logger.info("Quiz generated for URL: %s with %s questions", youtube_url, num_questions)
+        await cache_set("quiz", cache_key, quiz_questions)
         return quiz_questions
+    except ServiceOverloadedException:
+        raise
     except TranscriptException as e:
-        logger.error(f"TranscriptException: {str(e)}")
+        logger.error("TranscriptException: %s", e)
         raise APIException(status_code=503, detail=str(e))
     except Exception as e:
-        logger.error(f"Failed to generate quiz: {str(e)}")
+        logger.error("Failed to generate quiz: %s", e)
         raise APIException(status_code=500, detail="An unexpected error occurred while generating the quiz")
@@ -1,7 +1,76 @@
 import os
 import redis.asyncio as redis
 
-REDIS_URL = os.getenv("REDIS_URL")
-if not REDIS_URL:
-    raise ValueError("REDIS_URL environment variable is not set")
-redis_client = redis.from_url(REDIS_URL)
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", "100"))
+REDIS_BLOCKING_MAX_CONNECTIONS = int(os.getenv("REDIS_BLOCKING_MAX_CONNECTIONS", "10"))
+REDIS_HEALTH_CHECK_INTERVAL = int(os.getenv("REDIS_HEALTH_CHECK_INTERVAL", "30"))
+REDIS_SOCKET_TIMEOUT = float(os.getenv("REDIS_SOCKET_TIMEOUT", "5"))
+REDIS_SOCKET_CONNECT_TIMEOUT = float(os.getenv("REDIS_SOCKET_CONNECT_TIMEOUT", "5"))
+
+_redis_client: redis.Redis | None = None
+_blocking_redis_client: redis.Redis | None = None
+
+
+def _create_client(max_connections: int, socket_timeout: float | None) -> redis.Redis:
+    redis_url = os.getenv("REDIS_URL")
+    if not redis_url:
+        raise ValueError("REDIS_URL environment variable is not set")
+    return redis.from_url(
+        redis_url,
+        max_connections=max_connections,
+        health_check_interval=REDIS_HEALTH_CHECK_INTERVAL,
+        socket_timeout=socket_timeout,
+        socket_connect_timeout=REDIS_SOCKET_CONNECT_TIMEOUT,
+        socket_keepalive=True,
+    )
+
+
+def get_redis_client() -> redis.Redis:
+    """
+    Return the shared Redis client, creating it on first use.
+
+    Creating the client does not connect; connections are opened from the pool as
+    commands are sent. Raises ValueError if REDIS_URL is not set.
+    """
+    global _redis_client
+    if _redis_client is None:
+        _redis_client = _create_client(REDIS_MAX_CONNECTIONS, REDIS_SOCKET_TIMEOUT)
+    return _redis_client
+
+
+def get_blocking_redis_client() -> redis.Redis:
+    """
+    Return the shared Redis client for blocking reads, creating it on first use.
+
+    Used for XREADGROUP with BLOCK and for pub/sub, which wait longer than
+    REDIS_SOCKET_TIMEOUT when there is nothing to read. Its connections have no read
+    timeout, so an idle wait is not mistaken for a dead connection; TCP keepalive
+    detects dropped ones instead. Raises ValueError if REDIS_URL is not set.
+    """
+    global _blocking_redis_client
+    if _blocking_redis_client is None:
+        _blocking_redis_client = _create_client(REDIS_BLOCKING_MAX_CONNECTIONS, None)
+    return _blocking_redis_client
+
+
+def set_redis_client(client: redis.Redis | None) -> None:
+    """Replace the shared Redis client, for example with a fake one in offline tests."""
+    global _redis_client
+    _redis_client = client
+
+
+def set_blocking_redis_client(client: redis.Redis | None) -> None:
+    """Replace the shared Redis client for blocking reads, for example with a fake one in offline tests."""
+    global _blocking_redis_client
+    _blocking_redis_client = client
+
+
+async def close_redis_client() -> None:
+    """Close the shared Redis clients and their pools. Called on shutdown by every process using Redis."""
+    global _redis_client, _blocking_redis_client
+    if _redis_client is not None:
+        await _redis_client.aclose()
+        _redis_client = None
+    if _blocking_redis_client is not None:
+        await _blocking_redis_client.aclose()
+        _blocking_redis_client = None
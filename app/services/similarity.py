@@ -0,0 +1,167 @@
+import hashlib
+import logging
+import os
+import re
+import struct
+from collections import Counter
+from typing import Any, Callable
+from redis.exceptions import RedisError
+from app.core.metrics import time_stage
+from app.services.cache import cache_get
+from app.services.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+SIMILARITY_ENABLED = os.getenv("SIMILARITY_ENABLED", "true").lower() == "true"
+SIMILARITY_THRESHOLD = float(os.getenv("SIMILARITY_THRESHOLD", "0.8"))
+SIMILARITY_NUM_HASHES = int(os.getenv("SIMILARITY_NUM_HASHES", "128"))
+SIMILARITY_BANDS = int(os.getenv("SIMILARITY_BANDS", "32"))
+SIMILARITY_SHINGLE_SIZE = int(os.getenv("SIMILARITY_SHINGLE_SIZE", "5"))
+SIMILARITY_INDEX_TTL = int(os.getenv("SIMILARITY_INDEX_TTL", str(7 * 24 * 60 * 60)))
+
+_ROWS_PER_BAND = max(SIMILARITY_NUM_HASHES // SIMILARITY_BANDS, 1)
+_EMPTY_SLOT = (1 << 64) - 1
+_WORD_RE = re.compile(r"\w+")
+_stats: Counter = Counter()
+
+
+def similarity_stats() -> dict[str, int]:
+    """Return the near-duplicate index counters for this process."""
+    return {
+        "indexed": _stats["indexed"],
+        "duplicates_found": _stats["duplicates_found"],
+        "reused": _stats["reused"],
+        "errors": _stats["errors"],
+    }
+
+
+def _hash64(data: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "big")
+
+
+def transcript_signature(transcript: str) -> list[int]:
+    """
+    Compute the MinHash signature of a transcript over its word shingles.
+
+    Uses one-permutation hashing: each shingle is hashed once and only competes for the
+    minimum of the slot its hash falls in, so long transcripts stay cheap to sign.
+    """
+    words = _WORD_RE.findall(transcript.lower())
+    signature = [_EMPTY_SLOT] * SIMILARITY_NUM_HASHES
+    for i in range(max(len(words) - SIMILARITY_SHINGLE_SIZE + 1, 1)):
+        shingle_hash = _hash64(" ".join(words[i:i + SIMILARITY_SHINGLE_SIZE]).encode("utf-8"))
+        slot, value = shingle_hash % SIMILARITY_NUM_HASHES, shingle_hash // SIMILARITY_NUM_HASHES
+        if value < signature[slot]:
+            signature[slot] = value
+    return signature
+
+
+def estimate_similarity(a: list[int], b: list[int]) -> float:
+    """Estimate the Jaccard similarity of two transcripts from their signatures."""
+    filled = sum(1 for x, y in zip(a, b) if x != _EMPTY_SLOT or y != _EMPTY_SLOT)
+    if not filled:
+        return 0.0
+    return sum(1 for x, y in zip(a, b) if x == y and x != _EMPTY_SLOT) / filled
+
+
+def _signature_key(video_id: str, language: str) -> str:
+    return f"similarity:signature:{video_id}:{language}"
+
+
+def _duplicate_key(video_id: str, language: str) -> str:
+    return f"similarity:duplicate:{video_id}:{language}"
+
+
+def _bucket_keys(signature: list[int], language: str) -> list[str]:
+    """
+    Return the LSH bucket of each band of the signature.
+
+    Bands whose slots are all empty are skipped: short transcripts leave most slots
+    empty, and those bands would otherwise put unrelated videos in the same buckets.
+    """
+    keys = []
+    for band in range(SIMILARITY_BANDS):
+        rows = signature[band * _ROWS_PER_BAND:(band + 1) * _ROWS_PER_BAND]
+        if not rows:
+            break
+        if all(row == _EMPTY_SLOT for row in rows):
+            continue
+        digest = hashlib.blake2b(struct.pack(f">{len(rows)}Q", *rows), digest_size=8).hexdigest()
+        keys.append(f"similarity:bucket:{language}:{band}:{digest}")
+    return keys
+
+
+async def index_transcript(video_id: str, language: str, transcript: str) -> str | None:
+    """
+    Add a transcript to the near-duplicate index and return the video it duplicates, if any.
+
+    Candidates sharing an LSH bucket are checked against SIMILARITY_THRESHOLD. A match is
+    stored so generations for this video can reuse the artifacts of the earlier one.
+    Index errors are logged and never fail the transcript fetch.
+    """
+    if not SIMILARITY_ENABLED:
+        return None
+    try:
+        with time_stage("similarity_index"):
+            signature = transcript_signature(transcript)
+            buckets = _bucket_keys(signature, language)
+            pipe = get_redis_client().pipeline(transaction=False)
+            for bucket in buckets:
+                pipe.smembers(bucket)
+            members = await pipe.execute()
+            candidates = sorted({m.decode("utf-8") for group in members for m in group} - {video_id})
+            duplicate, best = None, SIMILARITY_THRESHOLD
+            if candidates:
+                blobs = await get_redis_client().mget([_signature_key(c, language) for c in candidates])
+                for candidate, blob in zip(candidates, blobs):
+                    if blob is None:
+                        continue
+                    score = estimate_similarity(signature, list(struct.unpack(f">{len(blob) // 8}Q", blob)))
+                    if score >= best:
+                        duplicate, best = candidate, score
+            pipe = get_redis_client().pipeline(transaction=False)
+            pipe.set(_signature_key(video_id, language), struct.pack(f">{len(signature)}Q", *signature), ex=SIMILARITY_INDEX_TTL)
+            for bucket in buckets:
+                pipe.sadd(bucket, video_id)
+                pipe.expire(bucket, SIMILARITY_INDEX_TTL)
+            if duplicate is not None:
+                pipe.set(_duplicate_key(video_id, language), duplicate, ex=SIMILARITY_INDEX_TTL)
+            await pipe.execute()
+        _stats["indexed"] += 1
+        if duplicate is not None:
+            _stats["duplicates_found"] += 1
+            logger.info("Transcript of %s is a near duplicate of %s (similarity %.2f)", video_id, duplicate, best)
+        return duplicate
+    except Exception as e:
+        _stats["errors"] += 1
+        logger.warning("Could not update the near-duplicate index for %s: %s", video_id, e)
+        return None
+
+
+async def find_near_duplicate(video_id: str, language: str) -> str | None:
+    """Return the earlier video whose transcript this video's transcript duplicates, if any."""
+    if not SIMILARITY_ENABLED:
+        return None
+    try:
+        duplicate = await get_redis_client().get(_duplicate_key(video_id, language))
+    except RedisError as e:
+        logger.warning("Could not read the near-duplicate index for %s: %s", video_id, e)
+        return None
+    return duplicate.decode("utf-8") if duplicate is not None else None
+
+
+async def cached_from_near_duplicate(kind: str, video_id: str, language: str, key_for: Callable[[str], str]) -> Any | None:
+    """
+    Return the cached artifact of the given kind from a near-duplicate video, if any.
+
+    key_for builds the cache key of the artifact for a video ID. Call this once the
+    transcript of video_id has been fetched, since that is when it gets indexed.
+    """
+    duplicate = await find_near_duplicate(video_id, language)
+    if duplicate is None:
+        return None
+    value = await cache_get(kind, key_for(duplicate))
+    if value is not None:
+        _stats["reused"] += 1
+        logger.info("Reusing %s of near duplicate %s for %s", kind, duplicate, video_id)
+    return value
@@ -0,0 +1,97 @@
+import asyncio
+import logging
+import os
+import time
+import uuid
+from collections import Counter
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+from app.services.redis_client import get_redis_client
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+SINGLE_FLIGHT_DISTRIBUTED = os.getenv("SINGLE_FLIGHT_DISTRIBUTED", "true").lower() == "true"
+SINGLE_FLIGHT_LOCK_TTL = int(os.getenv("SINGLE_FLIGHT_LOCK_TTL", "120"))
+SINGLE_FLIGHT_WAIT_TIMEOUT = float(os.getenv("SINGLE_FLIGHT_WAIT_TIMEOUT", "90"))
+SINGLE_FLIGHT_POLL_INTERVAL = float(os.getenv("SINGLE_FLIGHT_POLL_INTERVAL", "0.25"))
+
+_RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+_inflight: dict[str, asyncio.Task] = {}
+_stats: Counter = Counter()
+
+
+def single_flight_stats() -> dict[str, int]:
+    """Return the coalescing counters for this process."""
+    return {
+        "leaders": _stats["leaders"],
+        "coalesced": _stats["coalesced"],
+        "lock_acquired": _stats["lock_acquired"],
+        "lock_coalesced": _stats["lock_coalesced"],
+        "lock_timeouts": _stats["lock_timeouts"],
+        "in_flight": len(_inflight),
+    }
+
+
+async def _run_with_redis_lock(
+    key: str,
+    func: Callable[[], Awaitable[T]],
+    read_cached: Callable[[], Awaitable[Optional[T]]],
+) -> T:
+    """Run func under a Redis lock so only one worker per key calls upstream."""
+    lock_key = f"lock:{key}"
+    token = uuid.uuid4().hex
+    deadline = time.monotonic() + SINGLE_FLIGHT_WAIT_TIMEOUT
+    while True:
+        if await get_redis_client().set(lock_key, token, nx=True, ex=SINGLE_FLIGHT_LOCK_TTL):
+            _stats["lock_acquired"] += 1
+            try:
+                return await func()
+            finally:
+                await get_redis_client().eval(_RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+        cached = await read_cached()
+        if cached is not None:
+            _stats["lock_coalesced"] += 1
+            return cached
+        if time.monotonic() >= deadline:
+            _stats["lock_timeouts"] += 1
+            logger.warning("Timed out waiting for lock %s, generating without it", lock_key)
+            return await func()
+        await asyncio.sleep(SINGLE_FLIGHT_POLL_INTERVAL)
+
+
+async def single_flight(
+    key: str,
+    func: Callable[[], Awaitable[T]],
+    read_cached: Optional[Callable[[], Awaitable[Optional[T]]]] = None,
+) -> T:
+    """
+    Coalesce concurrent calls for the same key into a single execution of func.
+
+    Callers in this process share one task per key. When read_cached is given and
+    SINGLE_FLIGHT_DISTRIBUTED is enabled, the task also takes a Redis lock so other
+    workers wait for the cache entry instead of calling upstream themselves.
+    """
+    task = _inflight.get(key)
+    if task is not None:
+        _stats["coalesced"] += 1
+        return await asyncio.shield(task)
+    _stats["leaders"] += 1
+    if read_cached is not None and SINGLE_FLIGHT_DISTRIBUTED:
+        task = asyncio.ensure_future(_run_with_redis_lock(key, func, read_cached))
+    else:
+        task = asyncio.ensure_future(func())
+    _inflight[key] = task
+
+    def _forget(done: Any) -> None:
+        if _inflight.get(key) is done:
+            del _inflight[key]
+
+    task.add_done_callback(_forget)
+    return await asyncio.shield(task)
@@ -1,9 +1,27 @@
+import asyncio
 import logging
-from app.services.youtube import get_transcript_from_youtube
-from app.services.openai import async_client
-from app.utils.exceptions import APIException, TranscriptException
+from collections.abc import AsyncIterator
+from openai import AsyncOpenAI
+from app.services.youtube import extract_youtube_id
+from app.services.transcript_preprocessing import get_preprocessed_transcript
+from app.services.openai import create_response
+from app.utils.exceptions import APIException, TranscriptException, ServiceOverloadedException
 import os
-from app.services.redis_client import redis_client
+from app.services.cache import cache_get, cache_set
+from app.services.cache_keys import summary_cache_key, summary_chunk_cache_key
+from app.services.singleflight import single_flight
+from app.services.similarity import cached_from_near_duplicate
+from app.utils.tokens import count_tokens, split_into_chunks
+from app.core.logging import SAMPLED
+from app.core.metrics import record_openai_usage
+
+SUMMARY_CHUNK_TOKENS = int(os.getenv("SUMMARY_CHUNK_TOKENS", "12000"))
+SUMMARY_MAX_CONCURRENCY = int(os.getenv("SUMMARY_MAX_CONCURRENCY", "4"))
+SUMMARY_CHUNK_PROMPT = os.getenv("SUMMARY_CHUNK_PROMPT") or (
+    "Summarize this section of a longer transcript in the same language as the text. "
+    "Keep every key idea, definition and example, since it will be combined with the "
+    "summaries of the other sections. Do not add an introduction or a conclusion."
+)
 
 
 async def build_summary_prompt(language: str) -> str:
@@ -13,31 +31,157 @@ async def build_summary_prompt(language: str) -> str:
     return f"{prompt_lang}{base_prompt}"
 
 
+async def _summarize_chunk(chunk: str, semaphore: asyncio.Semaphore, client: AsyncOpenAI | None) -> str:
+    """Summarize one transcript chunk, reusing the cached partial summary if present."""
+    cache_key = summary_chunk_cache_key(chunk, SUMMARY_CHUNK_PROMPT)
+    cached = await cache_get("summary_chunk", cache_key)
+    if cached is not None:
+        return cached
+    async with semaphore:
+        response = await create_response(
+            client,
+            model="gpt-4o-mini",
+            instructions=SUMMARY_CHUNK_PROMPT,
+            input=chunk
+        )
+    await cache_set("summary_chunk", cache_key, response.output_text)
+    return response.output_text
+
+
+async def reduce_transcript(transcript: str, client: AsyncOpenAI | None = None) -> str:
+    """
+    Return the text to feed the final summary call.
+
+    Transcripts longer than SUMMARY_CHUNK_TOKENS are split on sentence boundaries,
+    the chunks are summarized concurrently (at most SUMMARY_MAX_CONCURRENCY at a time)
+    and the partial summaries are joined. Partial summaries are cached by content,
+    so only the final step depends on the language.
+    """
+    logger = logging.getLogger(__name__)
+    if count_tokens(transcript) <= SUMMARY_CHUNK_TOKENS:
+        return transcript
+    chunks = split_into_chunks(transcript, SUMMARY_CHUNK_TOKENS)
+    logger.info("Summarizing long transcript in %s chunks", len(chunks))
+    semaphore = asyncio.Semaphore(SUMMARY_MAX_CONCURRENCY)
+    partials = await asyncio.gather(*(_summarize_chunk(c, semaphore, client) for c in chunks))
+    return "\n\n".join(partials)
+
+
+async def summarize_transcript(transcript: str, language: str, client: AsyncOpenAI | None = None) -> str:
+    """Summarize a transcript in the given language, map-reducing long transcripts."""
+    prompt = await build_summary_prompt(language)
+    response = await create_response(
+        client,
+        model="gpt-4o-mini",
+        instructions=prompt,
+        input=await reduce_transcript(transcript, client)
+    )
+    return response.output_text
+
+
 async def generate_summary_from_youtube(youtube_url: str, language: str = "es") -> str:
     """Generate a summary from a YouTube video transcript."""
     logger = logging.getLogger(__name__)
-    cache_key = f"summary:{youtube_url}:{language}"
-    cached = await redis_client.get(cache_key)
-    if cached:
-        logger.info("Summary fetched from Redis cache")
-        if isinstance(cached, bytes):
-            return cached.decode("utf-8")
-        return str(cached)
+    cache_key = summary_cache_key(extract_youtube_id(youtube_url), language)
+    generate = lambda: single_flight(
+        cache_key,
+        lambda: _generate_summary(youtube_url, language, cache_key),
+        lambda: cache_get("summary", cache_key),
+    )
+    cached = await cache_get("summary", cache_key, refresh=generate)
+    if cached is not None:
+        logger.info("Summary fetched from Redis cache", extra=SAMPLED)
+        return cached
+    return await generate()
+
+
+async def _generate_summary(youtube_url: str, language: str, cache_key: str) -> str:
+    """Run the summary generation and store the result in Redis."""
+    logger = logging.getLogger(__name__)
     try:
-        logger.info(f"Fetching transcript for URL: {youtube_url}")
-        transcript = await get_transcript_from_youtube(youtube_url)
+        logger.info("Fetching transcript for URL: %s", youtube_url)
+        transcript = await get_preprocessed_transcript(youtube_url, language)
+        summary = await cached_from_near_duplicate(
+            "summary", extract_youtube_id(youtube_url), language, lambda video_id: summary_cache_key(video_id, language)
+        )
+        if summary is None:
+            summary = await summarize_transcript(transcript, language)
+        logger.info("Summary generated for URL: %s", youtube_url)
+        await cache_set("summary", cache_key, summary)
+        return summary
+    except ServiceOverloadedException:
+        raise
+    except TranscriptException as e:
+        logger.error("TranscriptException: %s", e)
+        raise APIException(status_code=503, detail=str(e))
+    except Exception as e:
+        logger.error("Failed to generate summary: %s", e)
+        raise APIException(status_code=500, detail="An unexpected error occurred while generating the summary")
+
+
+async def stream_summary_from_youtube(youtube_url: str, language: str = "es") -> AsyncIterator[str]:
+    """
+    Yield the summary of a YouTube video as text deltas.
+
+    A cached summary is replayed as a single delta. Otherwise the final summary call
+    is streamed and the assembled text is stored under the same key as
+    generate_summary_from_youtube once the stream completes.
+    """
+    logger = logging.getLogger(__name__)
+    video_id = extract_youtube_id(youtube_url)
+    cache_key = summary_cache_key(video_id, language)
+    cached = await cache_get(
+        "summary",
+        cache_key,
+        refresh=lambda: single_flight(
+            cache_key,
+            lambda: _generate_summary(youtube_url, language, cache_key),
+            lambda: cache_get("summary", cache_key),
+        ),
+    )
+    if cached is not None:
+        logger.info("Summary fetched from Redis cache", extra=SAMPLED)
+        yield cached
+        return
+    try:
+        logger.info("Fetching transcript for URL: %s", youtube_url)
+        transcript = await get_preprocessed_transcript(youtube_url, language)
+        reused = await cached_from_near_duplicate(
+            "summary", video_id, language, lambda duplicate_id: summary_cache_key(duplicate_id, language)
+        )
+        if reused is not None:
+            await cache_set("summary", cache_key, reused)
+            yield reused
+            return
         prompt = await build_summary_prompt(language)
-        response = await async_client.responses.create(
+        stream = await create_response(
             model="gpt-4o-mini",
             instructions=prompt,
-            input=transcript
+            input=await reduce_transcript(transcript),
+            stream=True
         )
-        logger.info(f"Summary generated for URL: {youtube_url}")
-        await redis_client.setex(cache_key, 60 * 60, response.output_text)  # 1 hora
-        return response.output_text
+    except ServiceOverloadedException:
+        raise
     except TranscriptException as e:
-        logger.error(f"TranscriptException: {str(e)}")
+        logger.error("TranscriptException: %s", e)
         raise APIException(status_code=503, detail=str(e))
     except Exception as e:
-        logger.error(f"Failed to generate summary: {str(e)}")
+        logger.error("Failed to start summary stream: %s", e)
         raise APIException(status_code=500, detail="An unexpected error occurred while generating the summary")
+    parts = []
+    try:
+        async for event in stream:
+            if event.type == "response.output_text.delta":
+                parts.append(event.delta)
+                yield event.delta
+            elif event.type in ("response.failed", "error"):
+                logger.error("Summary stream failed with event %s", event.type)
+                raise APIException(status_code=500, detail="An unexpected error occurred while generating the summary")
+            elif event.type == "response.completed":
+                record_openai_usage(event.response.usage)
+    finally:
+        # Frees the governor slot right away when the client disconnects mid-stream.
+        await stream.aclose()
+    logger.info("Summary streamed for URL: %s", youtube_url)
+    if parts:
+        await cache_set("summary", cache_key, "".join(parts))
@@ -0,0 +1,146 @@
+import html
+import logging
+import os
+import re
+from app.schemas.transcript import PreprocessedTranscript
+from app.services.cache import cache_get, cache_set
+from app.services.cache_keys import transcript_cache_key, preprocessed_transcript_cache_key
+from app.services.youtube import get_transcript_from_youtube, extract_youtube_id
+from app.core.logging import SAMPLED
+from app.core.metrics import time_stage, record_transcript_tokens
+from app.utils.tokens import count_tokens, split_into_chunks
+from app.utils.validators import SUPPORTED_LANGUAGES
+
+TRANSCRIPT_PREPROCESSING = os.getenv("TRANSCRIPT_PREPROCESSING", "true").lower() == "true"
+# Filler words are only removed for languages that have a list, since a filler in one
+# language can be a real word in another ("um" in Portuguese). Set per language with
+# TRANSCRIPT_FILLER_WORDS_<LANG>, for example TRANSCRIPT_FILLER_WORDS_ES=eh,este.
+_DEFAULT_FILLER_WORDS = {"en": "uh,uhm,um,umm,erm,hmm,mhm,mm"}
+TRANSCRIPT_FILLER_WORDS: dict[str, list[str]] = {
+    language: [
+        word.strip()
+        for word in os.getenv(f"TRANSCRIPT_FILLER_WORDS_{language.upper()}", _DEFAULT_FILLER_WORDS.get(language, "")).split(",")
+        if word.strip()
+    ]
+    for language in sorted(SUPPORTED_LANGUAGES)
+}
+TRANSCRIPT_COLLAPSE_REPEATS = os.getenv("TRANSCRIPT_COLLAPSE_REPEATS", "true").lower() == "true"
+# 0 keeps the whole transcript; otherwise it is cut down to this many tokens.
+TRANSCRIPT_MAX_TOKENS = int(os.getenv("TRANSCRIPT_MAX_TOKENS", "0"))
+# "truncate" keeps the beginning, "sample" keeps evenly spaced pieces of the whole transcript.
+TRANSCRIPT_BUDGET_STRATEGY = os.getenv("TRANSCRIPT_BUDGET_STRATEGY", "sample")
+
+_BUDGET_PIECE_TOKENS = 200
+
+# Bumped when the cleanup rules change, so transcripts cleaned by older rules are redone.
+_RULES_VERSION = 2
+# Identifies the settings in the cache key, so changing them invalidates preprocessed transcripts.
+_SETTINGS = repr((
+    _RULES_VERSION,
+    sorted(TRANSCRIPT_FILLER_WORDS.items()),
+    TRANSCRIPT_COLLAPSE_REPEATS,
+    TRANSCRIPT_MAX_TOKENS,
+    TRANSCRIPT_BUDGET_STRATEGY,
+))
+
+_TAGS = re.compile(r"\[[^\[\]\n]{1,40}\]|[♪♫]+")
+# A filler word with the punctuation around it, which _drop_filler puts back as needed.
+_FILLERS = {
+    language: re.compile(
+        r"(?P<lead>,\s*|(?:^|(?<=[.!?]))\s*)?\b(?:" + "|".join(map(re.escape, words)) + r")\b(?P<trail>,|\s*[.!?])?",
+        re.IGNORECASE,
+    )
+    for language, words in TRANSCRIPT_FILLER_WORDS.items()
+    if words
+}
+# A run of two to eight words immediately repeated, as auto-captions do when lines overlap.
+# Single repeated words are left alone, since "that that" or "1 1" can be real content.
+_REPEATED_PHRASE = re.compile(r"\b(\w+(?:[\s,]+\w+){1,7}?)(?:[\s,]+\1\b)+", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+_SPACE_BEFORE_PUNCTUATION = re.compile(r"\s+([,.!?;:])")
+
+
+def _drop_filler(match: re.Match) -> str:
+    """
+    Replace a filler word, keeping the punctuation that belongs to the sentence.
+
+    A comma after the filler goes with it. A sentence end after it is kept unless the
+    filler is the whole sentence, and then a comma before it is dropped instead.
+    """
+    lead, trail = match.group("lead"), (match.group("trail") or "").strip()
+    if trail and trail != ",":
+        if lead is not None and not lead.startswith(","):
+            return " "
+        return trail
+    return ", " if lead and lead.startswith(",") else " "
+
+
+def fit_to_budget(text: str, max_tokens: int, strategy: str = TRANSCRIPT_BUDGET_STRATEGY) -> str:
+    """Cut a text down to max_tokens, keeping its beginning or evenly spaced pieces of all of it."""
+    if max_tokens <= 0 or count_tokens(text) <= max_tokens:
+        return text
+    pieces = split_into_chunks(text, _BUDGET_PIECE_TOKENS)
+    sizes = [count_tokens(piece) for piece in pieces]
+    if strategy == "truncate":
+        kept, total = [], 0
+        for piece, size in zip(pieces, sizes):
+            if kept and total + size > max_tokens:
+                break
+            kept.append(piece)
+            total += size
+        return " ".join(kept)
+    keep = max(1, min(len(pieces), max_tokens * len(pieces) // sum(sizes)))
+    while True:
+        indexes = [int(i * len(pieces) / keep) for i in range(keep)]
+        if keep == 1 or sum(sizes[i] for i in indexes) <= max_tokens:
+            return " ".join(pieces[i] for i in indexes)
+        keep -= 1
+
+
+def preprocess_transcript(transcript: str, language: str) -> str:
+    """
+    Strip caption noise from a transcript: [Music]-style tags, the filler words of its
+    language and immediately repeated phrases, then fit it to TRANSCRIPT_MAX_TOKENS.
+    """
+    text = _TAGS.sub(" ", html.unescape(transcript))
+    fillers = _FILLERS.get(language)
+    if fillers is not None:
+        text = fillers.sub(_drop_filler, text)
+    text = _WHITESPACE.sub(" ", text)
+    if TRANSCRIPT_COLLAPSE_REPEATS:
+        text = _REPEATED_PHRASE.sub(r"\1", text)
+    text = _SPACE_BEFORE_PUNCTUATION.sub(r"\1", text).strip()
+    return fit_to_budget(text, TRANSCRIPT_MAX_TOKENS)
+
+
+def model_transcript_cache_entry(video_id: str, language: str) -> tuple[str, str]:
+    """Return the (kind, key) under which the transcript sent to the model is cached."""
+    if not TRANSCRIPT_PREPROCESSING:
+        return "transcript", transcript_cache_key(video_id, language)
+    return "transcript_preprocessed", preprocessed_transcript_cache_key(video_id, language, _SETTINGS)
+
+
+async def get_preprocessed_transcript(youtube_url: str, language: str = "es") -> str:
+    """
+    Get the transcript of a YouTube video ready to be sent to the model.
+
+    The preprocessed text is cached on its own, so the raw transcript is only fetched
+    and cleaned on a miss. Logs and records the tokens saved on every call.
+    """
+    logger = logging.getLogger(__name__)
+    if not TRANSCRIPT_PREPROCESSING:
+        return await get_transcript_from_youtube(youtube_url, language)
+    _, cache_key = model_transcript_cache_entry(extract_youtube_id(youtube_url), language)
+    prepared = await cache_get("transcript_preprocessed", cache_key)
+    if prepared is None:
+        transcript = await get_transcript_from_youtube(youtube_url, language)
+        with time_stage("transcript_preprocess"):
+            text = preprocess_transcript(transcript, language) or transcript
+            prepared = PreprocessedTranscript(text=text, original_tokens=count_tokens(transcript), tokens=count_tokens(text))
+        await cache_set("transcript_preprocessed", cache_key, prepared)
+    record_transcript_tokens(prepared.original_tokens, prepared.tokens)
+    logger.info(
+        "Transcript preprocessing saved %s of %s tokens",
+        prepared.original_tokens - prepared.tokens, prepared.original_tokens, extra=SAMPLED
+    )
+    return prepared.text
@@ -0,0 +1,185 @@
+import asyncio
+import logging
+import os
+from typing import Any, Awaitable, Callable
+from app.schemas.errors import ErrorDetail
+from app.schemas.quiz import QuizQuestion, QuizEnvelope
+from app.services.cache import cache_get, cache_set, cache_mget
+from app.services.cache_keys import summary_cache_key, quiz_cache_key
+from app.services.openai import create_response
+from app.services.quiz import QUIZ_RESPONSE_FORMAT, generate_quiz_from_youtube, parse_quiz_response
+from app.services.singleflight import single_flight
+from app.services.summary import generate_summary_from_youtube
+from app.services.youtube import extract_youtube_id
+from app.utils.exceptions import APIException, ServiceOverloadedException
+
+TRANSLATION_MAX_CONCURRENCY = int(os.getenv("TRANSLATION_MAX_CONCURRENCY", "4"))
+SUMMARY_TRANSLATION_PROMPT = os.getenv(
+    "SUMMARY_TRANSLATION_PROMPT",
+    "Translate the following summary into {language} (IMPORTANT). Keep its meaning, tone and "
+    "formatting, and return only the translation."
+)
+QUIZ_TRANSLATION_PROMPT = os.getenv(
+    "QUIZ_TRANSLATION_PROMPT",
+    "Translate the text of every question and answer of the following quiz into {language} (IMPORTANT). "
+    "Keep the same questions and answers in the same order, and keep every order, type and is_correct value unchanged."
+)
+
+logger = logging.getLogger(__name__)
+
+
+async def translate_summary(summary: str, language: str) -> str:
+    """Translate an already generated summary into another language."""
+    response = await create_response(
+        model="gpt-4o-mini",
+        instructions=SUMMARY_TRANSLATION_PROMPT.format(language=language),
+        input=summary
+    )
+    return response.output_text
+
+
+async def translate_quiz(questions: list[QuizQuestion], language: str) -> list[QuizQuestion]:
+    """
+    Translate already generated quiz questions into another language.
+
+    Only the texts are taken from the translation; order, type and which answers are
+    correct are copied from the original. Raises ValueError if the translation does not
+    have the same questions and answers.
+    """
+    response = await create_response(
+        model="gpt-4o-mini",
+        instructions=QUIZ_TRANSLATION_PROMPT.format(language=language),
+        input=QuizEnvelope(questions=questions).model_dump_json(),
+        text={"format": QUIZ_RESPONSE_FORMAT}
+    )
+    translated = await parse_quiz_response(response.output_text)
+    if len(translated) != len(questions) or any(
+        len(t.answers) != len(q.answers) for t, q in zip(translated, questions)
+    ):
+        raise ValueError("The translated quiz does not match the original questions")
+    return [
+        t.model_copy(update={
+            "order": q.order,
+            "type": q.type,
+            "answers": [ta.model_copy(update={"is_correct": qa.is_correct}) for ta, qa in zip(t.answers, q.answers)],
+        })
+        for t, q in zip(translated, questions)
+    ]
+
+
+async def _translate_and_cache(
+    kind: str, cache_key: str, translate: Callable[[], Awaitable[Any]], semaphore: asyncio.Semaphore
+) -> Any:
+    """Run one translation under the fan-out semaphore and store it under the language's normal key."""
+    try:
+        async with semaphore:
+            value = await translate()
+        await cache_set(kind, cache_key, value)
+        return value
+    except ServiceOverloadedException:
+        raise
+    except Exception as e:
+        logger.error("Failed to translate %s %s: %s", kind, cache_key, e)
+        raise APIException(status_code=500, detail=f"An unexpected error occurred while translating the {kind}")
+
+
+async def _fan_out(
+    kind: str,
+    languages: list[str],
+    source_language: str,
+    key_for: Callable[[str], str],
+    generate_source: Callable[[], Awaitable[Any]],
+    translate: Callable[[Any, str], Awaitable[Any]],
+) -> tuple[dict[str, Any], dict[str, ErrorDetail]]:
+    """
+    Resolve one artifact in several languages from a single generation.
+
+    Languages already cached are read with one MGET. The rest are translated concurrently
+    from the source language artifact, which is generated (or read) once.
+
+    Returns the artifacts by language and the errors of the languages that failed. A
+    failed source generation, or every language failing, raises the APIException instead.
+    """
+    values = await cache_mget([(kind, key_for(language)) for language in languages])
+    results = {language: value for language, value in zip(languages, values) if value is not None}
+    missing = [language for language in languages if language not in results]
+    if not missing:
+        return results, {}
+    source = results.get(source_language)
+    if source is None:
+        source = await generate_source()
+    semaphore = asyncio.Semaphore(TRANSLATION_MAX_CONCURRENCY)
+
+    async def resolve(language: str) -> Any:
+        if language == source_language:
+            return source
+        cache_key = key_for(language)
+        return await single_flight(
+            cache_key,
+            lambda: _translate_and_cache(kind, cache_key, lambda: translate(source, language), semaphore),
+            lambda: cache_get(kind, cache_key),
+        )
+
+    logger.info("Translating %s from %s into %s", kind, source_language, ", ".join(missing))
+    outcomes = await asyncio.gather(*(resolve(language) for language in missing), return_exceptions=True)
+    failures: dict[str, APIException] = {}
+    for language, outcome in zip(missing, outcomes):
+        if isinstance(outcome, APIException):
+            failures[language] = outcome
+        elif isinstance(outcome, BaseException):
+            if not isinstance(outcome, Exception):
+                raise outcome
+            logger.error("Failed to resolve %s in %s: %s", kind, language, outcome)
+            failures[language] = APIException(status_code=500, detail=f"An unexpected error occurred while translating the {kind}")
+        else:
+            results[language] = outcome
+    if failures and not results.keys() & set(languages):
+        raise next(iter(failures.values()))
+    return (
+        {language: results[language] for language in languages if language in results},
+        {language: ErrorDetail(status_code=e.status_code, detail=e.detail) for language, e in failures.items()},
+    )
+
+
+async def generate_multilingual_summary(
+    youtube_url: str, languages: list[str], source_language: str | None = None
+) -> tuple[dict[str, str], dict[str, ErrorDetail]]:
+    """
+    Summarize a YouTube video once and translate the summary into every requested language.
+
+    The source language (the first requested one by default) is summarized from the
+    transcript as usual; each other language is cached under its normal summary key.
+    Returns the summaries and the errors of the languages that could not be translated.
+    """
+    video_id = extract_youtube_id(youtube_url)
+    source_language = source_language or languages[0]
+    return await _fan_out(
+        "summary",
+        languages,
+        source_language,
+        lambda language: summary_cache_key(video_id, language),
+        lambda: generate_summary_from_youtube(youtube_url, source_language),
+        translate_summary,
+    )
+
+
+async def generate_multilingual_quiz(
+    youtube_url: str, languages: list[str], num_questions: int = 5, source_language: str | None = None
+) -> tuple[dict[str, list[QuizQuestion]], dict[str, ErrorDetail]]:
+    """
+    Generate a quiz for a YouTube video once and translate it into every requested language.
+
+    The source language (the first requested one by default) is generated from the
+    transcript as usual; each other language is cached under its normal quiz key.
+    Returns the quizzes and the errors of the languages that could not be translated.
+    """
+    video_id = extract_youtube_id(youtube_url)
+    source_language = source_language or languages[0]
+    return await _fan_out(
+        "quiz",
+        languages,
+        source_language,
+        lambda language: quiz_cache_key(video_id, language, num_questions),
+        lambda: generate_quiz_from_youtube(youtube_url, source_language, num_questions),
+        translate_quiz,
+    )
@@ -0,0 +1,150 @@
+import asyncio
+import logging
+import os
+import time
+from collections import Counter
+from pathlib import Path
+from app.services.cache import cache_mget, cache_expire
+from app.services.cache_keys import summary_cache_key, quiz_cache_key, quiz_pool_cache_key
+from app.services.quiz import generate_quiz_from_youtube
+from app.services.summary import generate_summary_from_youtube
+from app.services.transcript_preprocessing import get_preprocessed_transcript, model_transcript_cache_entry
+from app.services.youtube import extract_youtube_id, canonical_video_url
+from app.utils.exceptions import APIException
+from app.utils.validators import validate_youtube_url, validate_language
+
+WARMUP_CONCURRENCY = int(os.getenv("WARMUP_CONCURRENCY", "4"))
+WARMUP_RATE_PER_MINUTE = float(os.getenv("WARMUP_RATE_PER_MINUTE", "30"))
+WARMUP_CACHE_TTL = int(os.getenv("WARMUP_CACHE_TTL", str(30 * 24 * 60 * 60)))
+
+logger = logging.getLogger(__name__)
+
+
+def read_catalog(path: Path, default_language: str) -> list[tuple[str, str]]:
+    """
+    Read "<youtube_url> [language]" lines into (video_id, language) pairs.
+
+    Blank lines and lines starting with # are ignored, as are repeated entries.
+    Invalid lines are logged and skipped.
+    """
+    entries: dict[tuple[str, str], None] = {}
+    for number, line in enumerate(path.read_text(encoding="utf-8").splitlines(), start=1):
+        fields = line.replace(",", " ").split()
+        if not fields or fields[0].startswith("#"):
+            continue
+        try:
+            video_id = extract_youtube_id(validate_youtube_url(fields[0]))
+            language = validate_language(fields[1] if len(fields) > 1 else default_language)
+        except APIException as e:
+            logger.warning("Skipping line %s of %s: %s", number, path, e.detail)
+            continue
+        entries[(video_id, language)] = None
+    return list(entries)
+
+
+def read_done(state_path: Path) -> set[tuple[str, str]]:
+    """Return the (video_id, language) pairs completed by a previous run."""
+    if not state_path.exists():
+        return set()
+    done = set()
+    for line in state_path.read_text(encoding="utf-8").splitlines():
+        video_id, _, language = line.partition("\t")
+        if video_id and language:
+            done.add((video_id, language))
+    return done
+
+
+class StartPacer:
+    """Space out the start of entries so the warm-up stays within a per-minute budget."""
+
+    def __init__(self, per_minute: float):
+        self.interval = 60 / per_minute if per_minute > 0 else 0.0
+        self.next_start = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        async with self.lock:
+            delay = self.next_start - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self.next_start = max(self.next_start, time.monotonic()) + self.interval
+
+
+async def warm_entry(
+    video_id: str, language: str, mode: str, num_questions: int, ttl: int, pacer: StartPacer
+) -> bool:
+    """
+    Generate whatever is missing for one catalog entry and pin its keys to ttl.
+
+    Returns False when every artifact was already cached.
+    """
+    entries = [model_transcript_cache_entry(video_id, language)]
+    if mode in ("summary", "both"):
+        entries.append(("summary", summary_cache_key(video_id, language)))
+    if mode in ("quiz", "both"):
+        entries.append(("quiz", quiz_cache_key(video_id, language, num_questions)))
+    values = await cache_mget(entries)
+    missing = [kind for (kind, _), value in zip(entries, values) if value is None]
+    if missing:
+        await pacer.wait()
+        video_url = canonical_video_url(video_id)
+        # Fetch the transcript first so the summary and quiz generations share it.
+        await get_preprocessed_transcript(video_url, language)
+        generations = []
+        if "summary" in missing:
+            generations.append(generate_summary_from_youtube(video_url, language))
+        if "quiz" in missing:
+            generations.append(generate_quiz_from_youtube(video_url, language, num_questions))
+        await asyncio.gather(*generations)
+    pinned = [key for _, key in entries]
+    if mode in ("quiz", "both"):
+        pinned.append(quiz_pool_cache_key(video_id, language))
+    await cache_expire(pinned, ttl)
+    return bool(missing)
+
+
+async def run_warmup(
+    entries: list[tuple[str, str]],
+    state_path: Path,
+    mode: str = "both",
+    num_questions: int = 5,
+    concurrency: int = WARMUP_CONCURRENCY,
+    rate_per_minute: float = WARMUP_RATE_PER_MINUTE,
+    ttl: int = WARMUP_CACHE_TTL,
+) -> Counter:
+    """
+    Prefetch transcripts, summaries and quizzes for a catalog into the router cache keys.
+
+    Entries recorded in state_path by an earlier run are skipped, and each finished entry
+    is appended to it, so an interrupted warm-up resumes where it stopped. Failed entries
+    are not recorded and are retried on the next run.
+    """
+    done = read_done(state_path)
+    pending = [entry for entry in entries if entry not in done]
+    totals = Counter(resumed=len(entries) - len(pending))
+    logger.info("Warming %s entries (%s already done in a previous run)", len(pending), totals["resumed"])
+    semaphore = asyncio.Semaphore(concurrency)
+    pacer = StartPacer(rate_per_minute)
+
+    async def warm(video_id: str, language: str) -> None:
+        async with semaphore:
+            try:
+                generated = await warm_entry(video_id, language, mode, num_questions, ttl, pacer)
+            except APIException as e:
+                totals["failed"] += 1
+                logger.warning("Warm-up of %s (%s) failed: %s", video_id, language, e.detail)
+            except Exception as e:
+                totals["failed"] += 1
+                logger.error("Unexpected error warming %s (%s): %s", video_id, language, e)
+            else:
+                totals["generated" if generated else "cached"] += 1
+                with state_path.open("a", encoding="utf-8") as state:
+                    state.write(f"{video_id}\t{language}\n")
+            finished = totals["generated"] + totals["cached"] + totals["failed"]
+            logger.info(
+                "[%s/%s] %s (%s): %s generated, %s already cached, %s failed",
+                finished, len(pending), video_id, language, totals["generated"], totals["cached"], totals["failed"]
+            )
+
+    await asyncio.gather(*(warm(video_id, language) for video_id, language in pending))
+    return totals
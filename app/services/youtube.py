@@ -1,20 +1,26 @@
 import logging
 from urllib.parse import urlparse, parse_qs, quote
 import os
-from app.utils.exceptions import TranscriptException
-from app.services.redis_client import redis_client
-import httpx
+from app.utils.exceptions import TranscriptException, ServiceOverloadedException
+from app.services.cache import cache_get, cache_set
+from app.services.cache_keys import transcript_cache_key
+from app.services.singleflight import single_flight
+from app.services.similarity import index_transcript
+from app.services.governor import rapidapi_governor
+from app.services.http_client import get_transcript_http_client, get_with_retries, parse_retry_after
+from app.core.logging import SAMPLED
+from app.core.metrics import time_stage
 
 
 def extract_youtube_id(youtube_url: str) -> str:
     """Extract the video ID from a YouTube URL. Raises TranscriptException if invalid."""
     parsed = urlparse(str(youtube_url))
     if parsed.hostname in ["youtu.be"]:
-        if parsed.path and len(parsed.path) > 1 and not parsed.query:
-            return parsed.path[1:]
+        if parsed.path and len(parsed.path) > 1:
+            return parsed.path[1:].split("/")[0]
         else:
             raise TranscriptException("Invalid YouTube short URL format")
-    if parsed.hostname in ["www.youtube.com", "youtube.com"]:
+    if parsed.hostname in ["www.youtube.com", "youtube.com", "m.youtube.com"]:
         if parsed.path == "/watch":
             if "v" in parse_qs(parsed.query):
                 return parse_qs(parsed.query)["v"][0]
@@ -32,59 +38,75 @@ def extract_youtube_id(youtube_url: str) -> str:
                 raise TranscriptException("Invalid YouTube embed URL format")
     raise TranscriptException("Must be a valid YouTube URL")
 
+def canonical_video_url(video_id: str) -> str:
+    """Return the canonical watch URL for a video ID."""
+    return f"https://www.youtube.com/watch?v={video_id}"
+
 def build_transcript_endpoint(video_url: str, language: str = "en") -> str:
     """Build the endpoint URL for the transcript API request."""
     encoded_url = quote(video_url, safe='')
     lang = language or "en"
     return f"/api/transcript-with-url?url={encoded_url}&flat_text=true&lang={lang}"
 
-async def fetch_transcript_from_api(endpoint: str) -> str:
+async def fetch_transcript_from_api(video_id: str, language: str = "en") -> str:
     """Fetch the transcript from the external API. Raises TranscriptException on error."""
     logger = logging.getLogger(__name__)
-    cache_key = f"transcript:{endpoint}"
-    cached = await redis_client.get(cache_key)
-    if cached:
-        logger.info("Transcript fetched from Redis cache")
-        if isinstance(cached, bytes):
-            return cached.decode("utf-8")
-        return str(cached)
+    cache_key = transcript_cache_key(video_id, language)
+    cached = await cache_get("transcript", cache_key)
+    if cached is not None:
+        logger.info("Transcript fetched from Redis cache", extra=SAMPLED)
+        return cached
+    return await single_flight(
+        cache_key,
+        lambda: _request_transcript(video_id, language, cache_key),
+        lambda: cache_get("transcript", cache_key),
+    )
+
+async def _request_transcript(video_id: str, language: str, cache_key: str) -> str:
+    """Request the transcript from RapidAPI and store it in Redis."""
+    logger = logging.getLogger(__name__)
     rapidapi_key = os.getenv("RAPIDAPI_KEY")
     if not rapidapi_key:
         logger.error("RAPIDAPI_KEY environment variable not set.")
         raise TranscriptException("RAPIDAPI_KEY environment variable not set.")
-    headers = {
-        'x-rapidapi-key': rapidapi_key,
-        'x-rapidapi-host': "youtube-transcript3.p.rapidapi.com"
-    }
-    logger.info(f"Requesting transcript from endpoint: {endpoint}")
-    url = f"https://youtube-transcript3.p.rapidapi.com{endpoint}"
+    headers = {'x-rapidapi-key': rapidapi_key}
+    endpoint = build_transcript_endpoint(canonical_video_url(video_id), language)
+    logger.info("Requesting transcript from endpoint: %s", endpoint)
     try:
-        async with httpx.AsyncClient() as client:
-            res = await client.get(url, headers=headers)
-            res.raise_for_status()
-            result = res.json()
+        with time_stage("transcript_fetch"):
+            res = await get_with_retries(get_transcript_http_client(), endpoint, rapidapi_governor, headers=headers)
+        if res.status_code == 429:
+            raise ServiceOverloadedException("RapidAPI rate limit reached", retry_after=parse_retry_after(res) or 1)
+        res.raise_for_status()
+        result = res.json()
         if 'transcript' in result:
             logger.info("Transcript fetched from API successfully")
-            await redis_client.setex(cache_key, 60 * 60, result['transcript'])  # 1 hora
+            await cache_set("transcript", cache_key, result['transcript'])
+            await index_transcript(video_id, language, result['transcript'])
             return result['transcript']
         else:
-            logger.error(f"Unexpected API response: {result}")
-            raise TranscriptException(f"Unexpected API response: {result}")
+            logger.error(
+                "Unexpected API response without transcript (%s)",
+                ", ".join(result) if isinstance(result, dict) else type(result).__name__
+            )
+            raise TranscriptException("Unexpected API response: no transcript in response")
+    except ServiceOverloadedException:
+        raise
     except Exception as e:
-        logger.error(f"Could not fetch YouTube transcript: {e}")
+        logger.error("Could not fetch YouTube transcript: %s", e)
         raise TranscriptException(f"Could not fetch YouTube transcript: {e}")
 
 async def get_transcript_from_youtube(youtube_url: str, language: str = "es") -> str:
     """Get the transcript for a YouTube video, given its URL and language."""
     logger = logging.getLogger(__name__)
     try:
-        logger.info(f"Extracting video ID from URL: {youtube_url}")
+        logger.info("Extracting video ID from URL: %s", youtube_url, extra=SAMPLED)
         video_id = extract_youtube_id(youtube_url)
-        video_url = f"https://www.youtube.com/watch?v={video_id}"
-        endpoint = build_transcript_endpoint(video_url, language)
-        transcript = await fetch_transcript_from_api(endpoint)
-        logger.info(f"Transcript fetched for URL: {youtube_url}")
+        transcript = await fetch_transcript_from_api(video_id, language)
+        logger.info("Transcript fetched for URL: %s", youtube_url, extra=SAMPLED)
         return transcript
+    except ServiceOverloadedException:
+        raise
     except Exception as e:
-        logger.error(f"TranscriptException: Could not get transcript: {str(e)}")
+        logger.error("TranscriptException: Could not get transcript: %s", e)
         raise TranscriptException(f"Could not get transcript: {str(e)}")
@@ -10,9 +10,10 @@ class SpecificException(CustomException):
 
 class APIException(Exception):
     """Exception for API errors."""
-    def __init__(self, status_code: int = 400, detail: str = "API error"):
+    def __init__(self, status_code: int = 400, detail: str = "API error", headers: dict[str, str] | None = None):
         self.status_code = status_code
         self.detail = detail
+        self.headers = headers
         super().__init__(detail)
 
 class ValidationException(APIException):
@@ -28,4 +29,14 @@ class YouTubeException(APIException):
 class TranscriptException(APIException):
     """Exception for transcript errors."""
     def __init__(self, detail: str = "Transcript error"):
-        super().__init__(status_code=503, detail=detail)
\ No newline at end of file
+        super().__init__(status_code=503, detail=detail)
+
+class ServiceOverloadedException(APIException):
+    """Exception for requests shed because an upstream API is at its rate or concurrency limit."""
+    def __init__(self, detail: str = "Service overloaded", retry_after: float = 1):
+        self.retry_after = max(1, int(retry_after + 0.999))
+        super().__init__(
+            status_code=503,
+            detail=f"Service temporarily overloaded, retry later ({detail})",
+            headers={"Retry-After": str(self.retry_after)},
+        )
@@ -0,0 +1,71 @@
+import logging
+import re
+from functools import lru_cache
+import tiktoken
+
+TOKENIZER_ENCODING = "o200k_base"
+# Rough characters per token, used when the tokenizer files cannot be loaded.
+APPROX_CHARS_PER_TOKEN = 4
+
+logger = logging.getLogger(__name__)
+
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+")
+
+
+@lru_cache(maxsize=1)
+def get_encoding() -> tiktoken.Encoding | None:
+    """
+    Return the tokenizer used by the gpt-4o model family.
+
+    tiktoken downloads its encoding files on first use, so on hosts without access to
+    them this returns None and token counts fall back to an estimate.
+    """
+    try:
+        return tiktoken.get_encoding(TOKENIZER_ENCODING)
+    except Exception as e:
+        logger.warning("Could not load tokenizer %s, estimating token counts: %s", TOKENIZER_ENCODING, e)
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """Count the model tokens in a text."""
+    encoding = get_encoding()
+    if encoding is None:
+        return -(-len(text) // APPROX_CHARS_PER_TOKEN)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def _split_long_segment(segment: str, max_tokens: int) -> list[str]:
+    """Split a segment with no sentence boundaries into word-aligned pieces."""
+    pieces, current, current_tokens = [], [], 0
+    for word in segment.split():
+        word_tokens = count_tokens(" " + word)
+        if current and current_tokens + word_tokens > max_tokens:
+            pieces.append(" ".join(current))
+            current, current_tokens = [], 0
+        current.append(word)
+        current_tokens += word_tokens
+    if current:
+        pieces.append(" ".join(current))
+    return pieces
+
+
+def split_into_chunks(text: str, max_tokens: int) -> list[str]:
+    """
+    Split a text into chunks of at most max_tokens, breaking on sentence boundaries
+    where possible and on word boundaries otherwise.
+    """
+    chunks, current, current_tokens = [], [], 0
+    for sentence in _SENTENCE_BOUNDARY.split(text.strip()):
+        sentence_tokens = count_tokens(sentence)
+        segments = [sentence] if sentence_tokens <= max_tokens else _split_long_segment(sentence, max_tokens)
+        for segment in segments:
+            segment_tokens = sentence_tokens if len(segments) == 1 else count_tokens(segment)
+            if current and current_tokens + segment_tokens > max_tokens:
+                chunks.append(" ".join(current))
+                current, current_tokens = [], 0
+            current.append(segment)
+            current_tokens += segment_tokens
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
@@ -1,4 +1,6 @@
+import ipaddress
 import logging
+import os
 from urllib.parse import urlparse
 from app.utils.exceptions import ValidationException, YouTubeException
 
@@ -8,6 +10,12 @@ SUPPORTED_LANGUAGES = {
     'en', 'es', 'fr', 'de', 'it', 'pt', 'ru', 'ja', 'ko', 'zh', 'ar', 'hi'
 }
 
+# Hosts (and their subdomains) that job webhooks may be sent to. Empty allows any public host.
+WEBHOOK_ALLOWED_HOSTS = [
+    host.strip().lower() for host in os.getenv("WEBHOOK_ALLOWED_HOSTS", "").split(",") if host.strip()
+]
+WEBHOOK_ALLOW_HTTP = os.getenv("WEBHOOK_ALLOW_HTTP", "false").lower() == "true"
+
 def validate_youtube_url(url: str) -> str:
     """Validate and normalize a YouTube URL. Raises ValidationException or YouTubeException."""
     if not url or not url.strip():
@@ -28,12 +36,12 @@ def validate_youtube_url(url: str) -> str:
                 raise YouTubeException("Missing video ID in YouTube URL")
             elif parsed.path.startswith("/embed/") and len(parsed.path.split("/")) < 3:
                 raise YouTubeException("Invalid YouTube embed URL format")
-        logger.debug(f"YouTube URL validated: {url}")
+        logger.debug("YouTube URL validated: %s", url)
         return url
     except Exception as e:
         if isinstance(e, (ValidationException, YouTubeException)):
             raise
-        logger.error(f"URL validation error: {str(e)}")
+        logger.error("URL validation error: %s", e)
         raise ValidationException(f"Invalid URL format: {str(e)}")
 
 def validate_language(language: str) -> str:
@@ -44,15 +52,59 @@ def validate_language(language: str) -> str:
     if len(language) != 2:
         raise ValidationException("Language code must be exactly 2 characters")
     if language not in SUPPORTED_LANGUAGES:
-        logger.warning(f"Unsupported language code: {language}, using 'en' as fallback")
+        logger.warning("Unsupported language code: %s, using 'en' as fallback", language)
         return "en"
     return language
 
+def validate_languages(languages: list[str]) -> list[str]:
+    """Validate a list of language codes, dropping repeats. Raises ValidationException if it is empty."""
+    validated = list(dict.fromkeys(validate_language(language) for language in languages if language and language.strip()))
+    if not validated:
+        raise ValidationException("At least one language code is required")
+    return validated
+
+def is_public_address(address: str) -> bool:
+    """Return whether an IP address is globally routable, so not loopback, private, link-local or reserved."""
+    try:
+        return ipaddress.ip_address(address.split("%", 1)[0]).is_global
+    except ValueError:
+        return False
+
+def validate_webhook_url(url: str) -> str:
+    """
+    Validate a job webhook URL to keep the worker from calling internal services.
+
+    Requires https (unless WEBHOOK_ALLOW_HTTP) and a host in WEBHOOK_ALLOWED_HOSTS when
+    it is set. Without an allow-list, localhost and non-public IP literals are rejected;
+    hostnames are checked again against their resolved addresses on delivery.
+    Raises ValidationException.
+    """
+    parsed = urlparse(url)
+    schemes = ("https", "http") if WEBHOOK_ALLOW_HTTP else ("https",)
+    if parsed.scheme not in schemes:
+        raise ValidationException("Webhook URL must use https")
+    host = (parsed.hostname or "").lower().rstrip(".")
+    if not host or parsed.username or parsed.password:
+        raise ValidationException("Invalid webhook URL")
+    if WEBHOOK_ALLOWED_HOSTS:
+        if not any(host == allowed or host.endswith("." + allowed) for allowed in WEBHOOK_ALLOWED_HOSTS):
+            raise ValidationException("Webhook host is not allowed")
+        return url
+    if host == "localhost" or host.endswith(".localhost"):
+        raise ValidationException("Webhook host is not allowed")
+    try:
+        ipaddress.ip_address(host)
+    except ValueError:
+        return url
+    if not is_public_address(host):
+        raise ValidationException("Webhook host is not allowed")
+    return url
+
 def validate_num_questions(num_questions: int) -> int:
     """Validate the number of questions for quiz generation."""
     if num_questions <= 0:
         raise ValidationException("Number of questions must be greater than 0")
     if num_questions > 20:
         raise ValidationException("Number of questions cannot exceed 20")
-    logger.debug(f"Number of questions validated: {num_questions}")
+    logger.debug("Number of questions validated: %s", num_questions)
     return num_questions
@@ -0,0 +1,62 @@
+"""
+Micro-benchmark for the Redis cache codec.
+
+Compares the bytes stored and the encode/decode cost of each compression mode
+against the previous raw UTF-8 / json.dumps values, on synthetic transcripts and
+quizzes of typical sizes.
+
+    uv run python -m benchmarks.cache_codec
+"""
+import json
+import random
+import timeit
+from app.services.cache_codec import encode_payload, decode_payload
+
+WORDS = (
+    "the of and to in is that for it as was with be by on not he this are or his from at "
+    "which but have an they you were her she there been one all we their has would when "
+    "energy function variable equation lecture example student theorem proof data model"
+).split()
+
+
+def make_transcript(num_words: int, seed: int = 0) -> str:
+    """Build a caption-like text of the given length."""
+    rng = random.Random(seed)
+    return " ".join(rng.choice(WORDS) for _ in range(num_words))
+
+
+def make_quiz(num_questions: int, seed: int = 0) -> str:
+    """Build a quiz JSON payload shaped like the cached QuizQuestion list."""
+    rng = random.Random(seed)
+    return json.dumps([
+        {
+            "order": i + 1,
+            "question": make_transcript(15, seed + i) + "?",
+            "type": rng.choice(["single_choice", "multiple_choice", "true_false"]),
+            "answers": [{"answer": make_transcript(6, seed + i * 10 + j), "is_correct": j == 0} for j in range(4)],
+        }
+        for i in range(num_questions)
+    ])
+
+
+def bench(label: str, text: str, number: int = 200) -> None:
+    """Print size and timing figures for one payload."""
+    raw = text.encode("utf-8")
+    for compression in ("none", "zlib", "zstd"):
+        blob = encode_payload(raw, compression)
+        assert decode_payload(blob) == raw
+        encode_us = timeit.timeit(lambda: encode_payload(raw, compression), number=number) / number * 1e6
+        decode_us = timeit.timeit(lambda: decode_payload(blob), number=number) / number * 1e6
+        saved = 100 * (1 - len(blob) / len(raw))
+        print(
+            f"{label:<22} {compression:<5} raw={len(raw):>8} B  stored={len(blob):>8} B  "
+            f"saved={saved:6.1f}%  encode={encode_us:8.1f} us  decode={decode_us:8.1f} us"
+        )
+
+
+if __name__ == "__main__":
+    bench("transcript 10 min", make_transcript(1_500))
+    bench("transcript 1 h", make_transcript(9_000))
+    bench("transcript 3 h", make_transcript(27_000), number=50)
+    bench("quiz 5 questions", make_quiz(5))
+    bench("quiz 20 questions", make_quiz(20))
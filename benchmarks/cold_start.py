@@ -0,0 +1,110 @@
+"""
+Cold-start measurement for the API.
+
+Reports, over several runs, how long a fresh interpreter takes to import app.main
+(with no configuration, as an offline test would) and how long a fresh uvicorn process
+takes from launch until it serves its first /health/live and /health/ready requests.
+
+    uv run python -m benchmarks.cold_start --fake-redis --runs 5
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import httpx
+from benchmarks.load_test import start_fake_redis
+
+IMPORT_SNIPPET = "import time; s = time.perf_counter(); import app.main; print(time.perf_counter() - s)"
+
+
+def summarize(values: list[float]) -> dict:
+    return {
+        "min_ms": round(min(values) * 1000, 1),
+        "median_ms": round(statistics.median(values) * 1000, 1),
+        "max_ms": round(max(values) * 1000, 1),
+    }
+
+
+def measure_import() -> float:
+    """Import app.main in a fresh interpreter with an empty environment apart from PATH."""
+    env = {"PATH": os.environ.get("PATH", ""), "LOG_DIR": os.environ.get("LOG_DIR", "logs")}
+    result = subprocess.run([sys.executable, "-c", IMPORT_SNIPPET], env=env, capture_output=True, text=True, check=True)
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+async def wait_for(client: httpx.AsyncClient, url: str, process: subprocess.Popen, timeout: float) -> float:
+    """Poll url until it answers 200 and return the time it happened."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"API exited with code {process.returncode}")
+        try:
+            if (await client.get(url)).status_code == 200:
+                return time.perf_counter()
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(0.005)
+    raise RuntimeError(f"{url} did not answer in {timeout}s")
+
+
+async def measure_launch(port: int, redis_url: str, timeout: float) -> tuple[float, float]:
+    """Launch uvicorn and return the seconds until the first live and ready responses."""
+    env = {**os.environ, "REDIS_URL": redis_url, "LOG_DIR": os.environ.get("LOG_DIR", "logs")}
+    start = time.perf_counter()
+    api = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env=env,
+    )
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}") as client:
+            live = await wait_for(client, "/health/live", api, timeout)
+            ready = await wait_for(client, "/health/ready", api, timeout)
+    finally:
+        api.terminate()
+        api.wait(timeout=10)
+    return live - start, ready - start
+
+
+async def main(args: argparse.Namespace) -> dict:
+    redis_url = args.redis_url
+    fake_redis = None
+    if args.fake_redis:
+        fake_redis = start_fake_redis(args.fake_redis_port)
+        redis_url = f"redis://127.0.0.1:{args.fake_redis_port}/0"
+    try:
+        imports, lives, readies = [], [], []
+        for _ in range(args.runs):
+            imports.append(measure_import())
+            live, ready = await measure_launch(args.api_port, redis_url, args.timeout)
+            lives.append(live)
+            readies.append(ready)
+    finally:
+        if fake_redis is not None:
+            fake_redis.shutdown()
+    return {
+        "runs": args.runs,
+        "import_app_main": summarize(imports),
+        "launch_to_first_live_request": summarize(lives),
+        "launch_to_first_ready_request": summarize(readies),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure API import and cold-start times.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--api-port", type=int, default=8100)
+    parser.add_argument("--redis-url", default=os.environ.get("REDIS_URL", "redis://127.0.0.1:6379/0"))
+    parser.add_argument("--fake-redis", action="store_true", help="Use an in-process fakeredis server")
+    parser.add_argument("--fake-redis-port", type=int, default=6390)
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    args = parser.parse_args()
+    report = asyncio.run(main(args))
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
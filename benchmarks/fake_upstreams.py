@@ -0,0 +1,152 @@
+"""
+Local stand-ins for RapidAPI (YouTube Transcript3) and the OpenAI Responses API.
+
+Both are served by one FastAPI app so the benchmark can point TRANSCRIPT_API_BASE_URL
+and OPENAI_BASE_URL at it. Latency and payload sizes are configurable, and every call
+is counted so the load test can report upstream calls per scenario.
+
+    uv run python -m benchmarks.fake_upstreams --port 8101
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+from collections import Counter
+from urllib.parse import parse_qs, urlparse
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+import uvicorn
+
+WORDS = (
+    "the of and to in is that for it as was with be by on not this are or from at which but "
+    "have an they you were one all we their has would when energy function variable equation "
+    "lecture example student theorem proof data model um uh like you know [Music]"
+).split()
+
+config = {
+    "transcript_latency": 0.3,
+    "transcript_words": 3000,
+    "long_transcript_words": 30000,
+    "openai_latency": 1.5,
+    "openai_latency_per_1k_output": 0.5,
+    "summary_words": 150,
+}
+calls: Counter = Counter()
+
+app = FastAPI(title="Fake upstreams")
+
+
+def _text(num_words: int, seed: str) -> str:
+    rng = random.Random(seed)
+    return " ".join(rng.choice(WORDS) for _ in range(num_words))
+
+
+@app.get("/api/transcript-with-url")
+async def transcript(url: str, lang: str = "en"):
+    """Fake YouTube Transcript3: video IDs starting with 'long' get a long transcript."""
+    calls["rapidapi"] += 1
+    video_id = parse_qs(urlparse(url).query).get("v", ["unknown"])[0]
+    num_words = config["long_transcript_words"] if video_id.startswith("long") else config["transcript_words"]
+    await asyncio.sleep(config["transcript_latency"] * random.uniform(0.8, 1.2))
+    return {"success": True, "transcript": _text(num_words, f"{video_id}:{lang}")}
+
+
+def _quiz(num_questions: int) -> str:
+    return json.dumps([
+        {
+            "order": i + 1,
+            "question": _text(12, f"q{i}") + "?",
+            "type": "single_choice",
+            "answers": [{"answer": _text(5, f"a{i}{j}"), "is_correct": j == 0} for j in range(4)],
+        }
+        for i in range(num_questions)
+    ])
+
+
+@app.post("/v1/responses")
+async def responses(request: Request):
+    """Fake Responses API returning a summary, a quiz or a translation depending on the instructions."""
+    calls["openai"] += 1
+    body = await request.json()
+    instructions = body.get("instructions") or ""
+    input_text = body.get("input") if isinstance(body.get("input"), str) else json.dumps(body.get("input"))
+    if instructions.lower().startswith("translate") and input_text.lstrip().startswith("{"):
+        # A quiz translation keeps the JSON structure, so echoing it back is a faithful stand-in.
+        text = input_text
+    elif "quiz" in instructions.lower() or "question" in instructions.lower():
+        marker = instructions.rsplit("Create ", 1)[-1].split(" ", 1)[0]
+        text = _quiz(int(marker) if marker.isdigit() else 5)
+    else:
+        text = _text(config["summary_words"], instructions[:50])
+    output_tokens = len(text) // 4
+    generation_time = config["openai_latency_per_1k_output"] * output_tokens / 1000
+    await asyncio.sleep(config["openai_latency"] * random.uniform(0.8, 1.2))
+    response = {
+        "id": f"resp_{uuid.uuid4().hex}",
+        "object": "response",
+        "created_at": int(time.time()),
+        "status": "completed",
+        "model": body.get("model", "gpt-4o-mini"),
+        "output": [{
+            "type": "message",
+            "id": f"msg_{uuid.uuid4().hex}",
+            "role": "assistant",
+            "status": "completed",
+            "content": [{"type": "output_text", "text": text, "annotations": []}],
+        }],
+        "parallel_tool_calls": True,
+        "tool_choice": "auto",
+        "tools": [],
+        "usage": {
+            "input_tokens": len(input_text or "") // 4,
+            "input_tokens_details": {"cached_tokens": 0},
+            "output_tokens": output_tokens,
+            "output_tokens_details": {"reasoning_tokens": 0},
+            "total_tokens": len(input_text or "") // 4 + output_tokens,
+        },
+    }
+    if body.get("stream"):
+        calls["openai_stream"] += 1
+        return StreamingResponse(_stream_events(response, text, generation_time), media_type="text/event-stream")
+    await asyncio.sleep(generation_time)
+    return response
+
+
+async def _stream_events(response: dict, text: str, generation_time: float):
+    """Replay a finished response as Responses API stream events, spreading the generation time."""
+    words = text.split(" ")
+    sequence = 0
+    delay = generation_time / max(1, len(words) / 5)
+    for start in range(0, len(words), 5):
+        delta = " ".join(words[start:start + 5]) + " "
+        event = {
+            "type": "response.output_text.delta",
+            "item_id": response["output"][0]["id"],
+            "output_index": 0,
+            "content_index": 0,
+            "delta": delta,
+            "sequence_number": sequence,
+        }
+        sequence += 1
+        yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+        await asyncio.sleep(delay)
+    event = {"type": "response.completed", "response": response, "sequence_number": sequence}
+    yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+
+@app.get("/_stats")
+async def stats():
+    """Upstream call counts since start."""
+    return dict(calls)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run fake RapidAPI and OpenAI upstreams.")
+    parser.add_argument("--port", type=int, default=8101)
+    for name, default in config.items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=type(default), default=default)
+    args = parser.parse_args()
+    config.update({name: getattr(args, name) for name in config})
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
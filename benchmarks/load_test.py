@@ -0,0 +1,272 @@
+"""
+Repeatable load test for the API against local stand-ins for its upstreams.
+
+Starts the fake RapidAPI/OpenAI server (benchmarks.fake_upstreams), optionally an
+in-process fakeredis server, and the FastAPI app under uvicorn, then runs scripted
+traffic mixes and prints a JSON report (throughput, p50/p95/p99 latency and upstream
+call counts per scenario) that can be diffed between commits.
+
+    uv run python -m benchmarks.load_test --output bench.json
+    uv run python -m benchmarks.load_test --fake-redis --scenarios cold warm
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from collections import Counter
+import httpx
+
+API_KEY = "bench"
+
+SCENARIOS = ("cold", "warm", "hot_key_storm", "long_transcript", "mixed")
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+
+def video_url(video_id: str) -> str:
+    return f"https://www.youtube.com/watch?v={video_id}"
+
+
+async def upstream_calls(client: httpx.AsyncClient, upstream_url: str) -> Counter:
+    return Counter((await client.get(f"{upstream_url}/_stats")).json())
+
+
+async def run_requests(
+    client: httpx.AsyncClient,
+    api_url: str,
+    upstream_url: str,
+    requests: list[tuple[str, dict]],
+    concurrency: int,
+) -> dict:
+    """Send the requests with bounded concurrency and summarize latencies and upstream calls."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    statuses: Counter = Counter()
+
+    async def send(path: str, params: dict) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                response = await client.get(f"{api_url}{path}", params=params, headers={"API-Key": API_KEY})
+                statuses[str(response.status_code)] += 1
+            except httpx.HTTPError as e:
+                statuses[type(e).__name__] += 1
+            latencies.append(time.perf_counter() - start)
+
+    before = await upstream_calls(client, upstream_url)
+    start = time.perf_counter()
+    await asyncio.gather(*(send(path, params) for path, params in requests))
+    duration = time.perf_counter() - start
+    after = await upstream_calls(client, upstream_url)
+    latencies.sort()
+    return {
+        "requests": len(requests),
+        "concurrency": concurrency,
+        "statuses": dict(statuses),
+        "errors": sum(n for status, n in statuses.items() if status != "200"),
+        "duration_s": round(duration, 3),
+        "throughput_rps": round(len(requests) / duration, 2) if duration else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50) * 1000, 2),
+            "p95": round(percentile(latencies, 95) * 1000, 2),
+            "p99": round(percentile(latencies, 99) * 1000, 2),
+            "max": round(latencies[-1] * 1000, 2) if latencies else 0.0,
+            "mean": round(sum(latencies) / len(latencies) * 1000, 2) if latencies else 0.0,
+        },
+        "upstream_calls": {name: after[name] - before[name] for name in set(after) | set(before)},
+    }
+
+
+def summary_request(video_id: str, language: str = "en") -> tuple[str, dict]:
+    return "/summary/", {"youtube_url": video_url(video_id), "language": language}
+
+
+def quiz_request(video_id: str, language: str = "en", num_questions: int = 5) -> tuple[str, dict]:
+    return "/quiz/", {"youtube_url": video_url(video_id), "language": language, "num_questions": num_questions}
+
+
+def pack_request(video_id: str, language: str = "en", num_questions: int = 5) -> tuple[str, dict]:
+    return "/learning-pack/", {"youtube_url": video_url(video_id), "language": language, "num_questions": num_questions}
+
+
+async def run_scenarios(args: argparse.Namespace, api_url: str, upstream_url: str) -> dict:
+    """Run each selected scenario on fresh video IDs so no scenario sees another's cache entries."""
+    run_id = uuid.uuid4().hex[:6]
+    rng = random.Random(args.seed)
+    results = {}
+    limits = httpx.Limits(max_connections=args.concurrency * 2, max_keepalive_connections=args.concurrency * 2)
+    async with httpx.AsyncClient(timeout=args.request_timeout, limits=limits) as client:
+        for scenario in args.scenarios:
+            prefix = f"{scenario}-{run_id}"
+            if scenario == "cold":
+                requests = [summary_request(f"{prefix}-{i}") for i in range(args.videos)]
+                results[scenario] = await run_requests(client, api_url, upstream_url, requests, args.concurrency)
+            elif scenario == "warm":
+                requests = [summary_request(f"{prefix}-{i}") for i in range(args.videos)]
+                await run_requests(client, api_url, upstream_url, requests, args.concurrency)
+                requests = requests * args.warm_repeats
+                rng.shuffle(requests)
+                results[scenario] = await run_requests(client, api_url, upstream_url, requests, args.concurrency)
+            elif scenario == "hot_key_storm":
+                requests = [summary_request(f"{prefix}-hot")] * args.storm_size
+                results[scenario] = await run_requests(client, api_url, upstream_url, requests, args.storm_size)
+            elif scenario == "long_transcript":
+                requests = [summary_request(f"long-{prefix}-{i}") for i in range(args.long_videos)]
+                results[scenario] = await run_requests(client, api_url, upstream_url, requests, args.concurrency)
+            elif scenario == "mixed":
+                # Zipf-like popularity: a few hot videos and a long tail.
+                weights = [1 / (rank + 1) for rank in range(args.videos)]
+                builders = (summary_request, quiz_request, pack_request)
+                requests = [
+                    rng.choice(builders)(f"{prefix}-{rng.choices(range(args.videos), weights)[0]}")
+                    for _ in range(args.mixed_requests)
+                ]
+                results[scenario] = await run_requests(client, api_url, upstream_url, requests, args.concurrency)
+            print(f"{scenario}: {json.dumps(results[scenario])}", file=sys.stderr)
+    return results
+
+
+async def wait_until_ready(url: str, process: subprocess.Popen, timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise RuntimeError(f"{url} exited with code {process.returncode}")
+            try:
+                if (await client.get(url)).status_code < 500:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"{url} did not become ready in {timeout}s")
+
+
+def start_fake_redis(port: int):
+    """Serve fakeredis over TCP from a background thread."""
+    import threading
+    from fakeredis import TcpFakeServer
+
+    server = TcpFakeServer(("127.0.0.1", port), server_type="redis")
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def main(args: argparse.Namespace) -> dict:
+    upstream_url = f"http://127.0.0.1:{args.upstream_port}"
+    api_url = f"http://127.0.0.1:{args.api_port}"
+    redis_url = args.redis_url
+    fake_redis = None
+    if args.fake_redis:
+        fake_redis = start_fake_redis(args.fake_redis_port)
+        redis_url = f"redis://127.0.0.1:{args.fake_redis_port}/0"
+    upstream = subprocess.Popen([
+        sys.executable, "-m", "benchmarks.fake_upstreams",
+        "--port", str(args.upstream_port),
+        "--transcript-latency", str(args.transcript_latency),
+        "--openai-latency", str(args.openai_latency),
+        "--transcript-words", str(args.transcript_words),
+        "--long-transcript-words", str(args.long_transcript_words),
+    ])
+    # Logs go to a scratch directory so bench runs do not write into the working tree.
+    log_dir = os.environ.get("LOG_DIR") or tempfile.mkdtemp(prefix="load-test-logs-")
+    env = {
+        **os.environ,
+        "REDIS_URL": redis_url,
+        "API_KEY": API_KEY,
+        "RAPIDAPI_KEY": "bench",
+        "OPENAI_API_KEY": "bench",
+        "OPENAI_BASE_URL": f"{upstream_url}/v1",
+        "TRANSCRIPT_API_BASE_URL": upstream_url,
+        "TRANSCRIPT_HTTP2": "false",
+        "LOG_SAMPLE_RATE": os.environ.get("LOG_SAMPLE_RATE", "0"),
+        "LOG_DIR": log_dir,
+    }
+    # The production governor budgets would make the scenarios measure throttling and
+    # shedding instead of the app, so both upstreams get the limits given on the command line.
+    for upstream_name in ("OPENAI", "RAPIDAPI"):
+        prefix = f"GOVERNOR_{upstream_name}"
+        env[f"{prefix}_RPM"] = str(args.governor_rpm)
+        env[f"{prefix}_TPM"] = str(args.governor_tpm)
+        env[f"{prefix}_MAX_CONCURRENCY"] = str(args.governor_max_concurrency)
+        env[f"{prefix}_MAX_QUEUE"] = str(args.governor_max_queue)
+        env[f"{prefix}_MAX_WAIT"] = str(args.governor_max_wait)
+    api = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(args.api_port),
+         "--workers", str(args.workers), "--log-level", "warning", "--no-access-log"],
+        env=env,
+    )
+    try:
+        await wait_until_ready(f"{upstream_url}/_stats", upstream)
+        await wait_until_ready(f"{api_url}/", api)
+        scenarios = await run_scenarios(args, api_url, upstream_url)
+    finally:
+        for process in (api, upstream):
+            process.terminate()
+            process.wait(timeout=10)
+        if fake_redis is not None:
+            fake_redis.shutdown()
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "config": {k: v for k, v in vars(args).items() if k != "output"},
+            "log_dir": log_dir,
+        },
+        "scenarios": scenarios,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load-test the API against fake upstreams.")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+    parser.add_argument("--api-port", type=int, default=8100)
+    parser.add_argument("--upstream-port", type=int, default=8101)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--redis-url", default="redis://localhost:6379/15")
+    parser.add_argument("--fake-redis", action="store_true", help="Use an in-process fakeredis server")
+    parser.add_argument("--fake-redis-port", type=int, default=8102)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--videos", type=int, default=50)
+    parser.add_argument("--warm-repeats", type=int, default=4)
+    parser.add_argument("--storm-size", type=int, default=100)
+    parser.add_argument("--long-videos", type=int, default=5)
+    parser.add_argument("--mixed-requests", type=int, default=500)
+    parser.add_argument("--transcript-latency", type=float, default=0.3)
+    parser.add_argument("--openai-latency", type=float, default=1.5)
+    parser.add_argument("--transcript-words", type=int, default=3000)
+    parser.add_argument("--long-transcript-words", type=int, default=30000)
+    parser.add_argument("--request-timeout", type=float, default=120)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--governor-rpm", type=int, default=1_000_000, help="Requests per minute allowed to each upstream")
+    parser.add_argument("--governor-tpm", type=int, default=0, help="OpenAI tokens per minute, 0 for no limit")
+    parser.add_argument("--governor-max-concurrency", type=int, default=256)
+    parser.add_argument("--governor-max-queue", type=int, default=10_000)
+    parser.add_argument("--governor-max-wait", type=float, default=120)
+    args = parser.parse_args()
+    report = asyncio.run(main(args))
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
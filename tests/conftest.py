@@ -0,0 +1,66 @@
+import asyncio
+from types import SimpleNamespace
+import fakeredis
+import pytest
+from app.services import cache, singleflight
+from app.services.openai import set_openai_client
+from app.services.redis_client import set_redis_client, set_blocking_redis_client
+from app.utils import tokens
+
+
+class StubResponses:
+    """Stand-in for AsyncOpenAI.responses that records calls and how many overlapped."""
+
+    def __init__(self, reply, delay: float):
+        self.reply = reply
+        self.delay = delay
+        self.calls: list[dict] = []
+        self.active = 0
+        self.max_active = 0
+
+    async def create(self, **kwargs):
+        self.calls.append(kwargs)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        return SimpleNamespace(output_text=self.reply(kwargs), usage=None)
+
+
+class StubOpenAI:
+    def __init__(self, reply, delay: float = 0.01):
+        self.responses = StubResponses(reply, delay)
+
+    async def close(self) -> None:
+        pass
+
+
+@pytest.fixture(autouse=True)
+def estimated_tokens(monkeypatch):
+    """Count tokens with the offline estimate (4 characters per token) so results do not depend on tiktoken's files."""
+    monkeypatch.setattr(tokens, "get_encoding", lambda: None)
+
+
+@pytest.fixture
+def redis_client():
+    """Point the app at an in-memory Redis and start every test with empty caches."""
+    client = fakeredis.FakeAsyncRedis()
+    set_redis_client(client)
+    set_blocking_redis_client(client)
+    cache.local_cache.clear()
+    singleflight._inflight.clear()
+    yield client
+    set_redis_client(None)
+    set_blocking_redis_client(None)
+    cache.local_cache.clear()
+
+
+@pytest.fixture
+def openai_stub(redis_client):
+    """Install a stub OpenAI client whose replies echo the start of each input."""
+    client = StubOpenAI(lambda kwargs: f"summary of: {str(kwargs['input'])[:20]}")
+    set_openai_client(client)
+    yield client
+    set_openai_client(None)
@@ -0,0 +1,26 @@
+import asyncio
+import pytest
+from fastapi import HTTPException
+from app.security import auth
+
+
+def test_valid_key_is_accepted(monkeypatch):
+    monkeypatch.setattr(auth, "API_KEY", "secret")
+
+    assert asyncio.run(auth.validate_api_key("secret")) == "secret"
+
+
+@pytest.mark.parametrize("header", [None, "", "wrong"])
+def test_invalid_key_is_rejected(monkeypatch, header):
+    monkeypatch.setattr(auth, "API_KEY", "secret")
+
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(auth.validate_api_key(header))
+    assert exc.value.status_code == 403
+
+
+def test_missing_configuration_rejects_every_request(monkeypatch):
+    monkeypatch.setattr(auth, "API_KEY", None)
+
+    with pytest.raises(HTTPException):
+        asyncio.run(auth.validate_api_key(None))
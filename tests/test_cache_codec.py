@@ -0,0 +1,32 @@
+import pytest
+from app.services.cache_codec import CACHE_MAGIC, decode_payload, encode_payload
+
+
+@pytest.mark.parametrize("compression", ["none", "zlib", "zstd"])
+def test_round_trip(compression):
+    data = ("a transcript that repeats itself " * 100).encode("utf-8")
+
+    blob = encode_payload(data, compression)
+
+    assert blob.startswith(CACHE_MAGIC)
+    assert decode_payload(blob) == data
+    if compression != "none":
+        assert len(blob) < len(data)
+
+
+def test_small_values_are_not_compressed():
+    blob = encode_payload(b"short", "zstd")
+
+    assert blob[3] == 0
+    assert blob[4:] == b"short"
+
+
+@pytest.mark.parametrize("blob", [b"plain value from before the codec", "not bytes", b"YC", b"YC\x09\x00data"])
+def test_unknown_formats_are_misses(blob):
+    assert decode_payload(blob) is None
+
+
+def test_corrupt_compressed_value_is_a_miss():
+    blob = encode_payload(b"x" * 4096, "zstd")
+
+    assert decode_payload(blob[:4] + b"garbage") is None
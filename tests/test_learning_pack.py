@@ -0,0 +1,31 @@
+import asyncio
+from app.schemas.quiz import QuizAnswer, QuizQuestion
+from app.services import learning_pack, summary
+
+URL = "https://www.youtube.com/watch?v=abcdefghijk"
+QUIZ = [QuizQuestion(order=1, question="Q?", type="multiple_choice", answers=[QuizAnswer(answer="A", is_correct=True)])]
+
+
+def test_pack_shares_the_summary_generation_with_summary_requests(openai_stub, monkeypatch):
+    async def transcript(youtube_url, language):
+        return "A short transcript about derivatives."
+
+    async def quiz_from_pool(video_id, language, num_questions, load_transcript):
+        await load_transcript()
+        return QUIZ
+
+    monkeypatch.setattr(summary, "get_preprocessed_transcript", transcript)
+    monkeypatch.setattr(learning_pack, "get_preprocessed_transcript", transcript)
+    monkeypatch.setattr(learning_pack, "quiz_from_pool", quiz_from_pool)
+
+    async def run():
+        return await asyncio.gather(
+            summary.generate_summary_from_youtube(URL, "en"),
+            learning_pack.generate_learning_pack_from_youtube(URL, "en", 1),
+        )
+
+    summary_text, pack = asyncio.run(run())
+
+    assert pack.summary == summary_text
+    assert pack.quiz == QUIZ
+    assert len(openai_stub.responses.calls) == 1
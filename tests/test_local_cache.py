@@ -0,0 +1,72 @@
+import time
+from app.services.local_cache import LocalCache
+
+
+def test_get_returns_stored_values():
+    cache = LocalCache(max_entries=10, max_bytes=1000, ttl=60)
+
+    cache.set("a", "value", 5)
+
+    assert cache.get("a") == "value"
+    assert cache.get("missing") is None
+    assert cache.stats["hits"] == 1
+    assert cache.stats["misses"] == 1
+
+
+def test_least_recently_used_entry_is_evicted_by_count():
+    cache = LocalCache(max_entries=2, max_bytes=1000, ttl=60)
+    cache.set("a", 1, 1)
+    cache.set("b", 2, 1)
+    cache.get("a")
+
+    cache.set("c", 3, 1)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats["evictions"] == 1
+
+
+def test_entries_are_evicted_by_total_bytes():
+    cache = LocalCache(max_entries=10, max_bytes=100, ttl=60)
+    cache.set("a", 1, 60)
+
+    cache.set("b", 2, 60)
+
+    assert cache.get("a") is None
+    assert cache.total_bytes == 60
+
+
+def test_values_larger_than_the_cache_are_not_stored():
+    cache = LocalCache(max_entries=10, max_bytes=100, ttl=60)
+    cache.set("a", "old", 10)
+
+    cache.set("a", "new", 200)
+
+    assert cache.get("a") is None
+    assert cache.total_bytes == 0
+
+
+def test_entries_expire_after_their_ttl():
+    cache = LocalCache(max_entries=10, max_bytes=1000, ttl=60)
+
+    cache.set("a", 1, 1, ttl=0.01)
+    time.sleep(0.02)
+
+    assert cache.get("a") is None
+    assert cache.stats["expirations"] == 1
+    assert len(cache) == 0
+
+
+def test_invalidate_and_clear():
+    cache = LocalCache(max_entries=10, max_bytes=1000, ttl=60)
+    cache.set("a", 1, 1)
+    cache.set("b", 2, 1)
+
+    cache.invalidate("a")
+    assert cache.get("a") is None
+    assert cache.stats["invalidations"] == 1
+
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.total_bytes == 0
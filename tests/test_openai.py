@@ -0,0 +1,58 @@
+import asyncio
+from types import SimpleNamespace
+from app.services.governor import openai_governor
+from app.services.openai import create_response
+
+
+class StubStream:
+    def __init__(self, deltas: list[str]):
+        self.deltas = deltas
+        self.closed = False
+
+    async def __aiter__(self):
+        for delta in self.deltas:
+            await asyncio.sleep(0)
+            yield SimpleNamespace(type="response.output_text.delta", delta=delta)
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class StubStreamingClient:
+    def __init__(self, stream: StubStream):
+        self.responses = SimpleNamespace(create=self.create)
+        self.stream = stream
+
+    async def create(self, **kwargs):
+        return self.stream
+
+
+def test_stream_holds_the_governor_slot_until_exhausted(redis_client):
+    upstream = StubStream(["a", "b", "c"])
+
+    async def run():
+        stream = await create_response(StubStreamingClient(upstream), model="m", input="x", stream=True)
+        active_during = []
+        async for _ in stream:
+            active_during.append(openai_governor.snapshot()["active"])
+        return active_during, openai_governor.snapshot()["active"]
+
+    active_during, active_after = asyncio.run(run())
+
+    assert active_during == [1, 1, 1]
+    assert active_after == 0
+    assert upstream.closed
+
+
+def test_closing_a_stream_early_releases_the_slot(redis_client):
+    upstream = StubStream(["a", "b", "c"])
+
+    async def run():
+        stream = await create_response(StubStreamingClient(upstream), model="m", input="x", stream=True)
+        async for _ in stream:
+            break
+        await stream.aclose()
+        return openai_governor.snapshot()["active"]
+
+    assert asyncio.run(run()) == 0
+    assert upstream.closed
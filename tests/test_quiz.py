@@ -0,0 +1,75 @@
+import asyncio
+import json
+from app.schemas.quiz import QuizQuestion
+from app.services import quiz
+from app.services.cache import cache_set, CACHE_TTLS
+from app.services.cache_keys import quiz_pool_cache_key
+from app.services.quiz import parse_quiz_response, salvage_quiz_questions
+
+
+def question(order: int) -> dict:
+    return {
+        "order": order,
+        "question": f"Question {order}?",
+        "type": "multiple_choice",
+        "answers": [{"answer": "Yes", "is_correct": True}, {"answer": "No", "is_correct": False}],
+    }
+
+
+def test_parses_structured_output_envelope():
+    raw = json.dumps({"questions": [question(1), question(2)]})
+
+    questions = asyncio.run(parse_quiz_response(raw))
+
+    assert [q.order for q in questions] == [1, 2]
+    assert questions[0].answers[0].is_correct
+
+
+def test_parses_a_bare_list_in_a_code_fence():
+    raw = "```json\n" + json.dumps([question(1)]) + "\n```"
+
+    questions = asyncio.run(parse_quiz_response(raw))
+
+    assert [q.question for q in questions] == ["Question 1?"]
+
+
+def test_salvages_complete_questions_from_truncated_output():
+    full = json.dumps({"questions": [question(1), question(2), question(3)]})
+    truncated = full[:full.index('"Question 3?"') + 5]
+
+    questions = asyncio.run(parse_quiz_response(truncated))
+
+    assert [q.order for q in questions] == [1, 2]
+
+
+def test_salvage_skips_invalid_questions():
+    raw = json.dumps([question(1), {"order": 2, "question": "No answers"}, question(3)])
+
+    assert [q.order for q in salvage_quiz_questions(raw)] == [1, 3]
+
+
+def test_salvage_without_a_list_returns_nothing():
+    assert salvage_quiz_questions("Sorry, I cannot create a quiz for this video.") == []
+
+
+def test_top_up_keeps_the_ttl_of_a_pinned_pool(redis_client, monkeypatch):
+    pinned_ttl = 30 * 24 * 60 * 60
+    pool_key = quiz_pool_cache_key("abc", "en")
+
+    async def generate(transcript, language, num_questions, existing):
+        return [QuizQuestion.model_validate(question(len(existing) + i + 1)) for i in range(num_questions)]
+
+    async def load_transcript():
+        return "transcript"
+
+    monkeypatch.setattr(quiz, "generate_quiz_from_transcript", generate)
+
+    async def run():
+        await cache_set("quiz_pool", pool_key, [QuizQuestion.model_validate(question(1))], ttl=pinned_ttl)
+        pool = await quiz._top_up_quiz_pool("abc", pool_key, "en", 3, load_transcript)
+        return pool, await redis_client.ttl(pool_key)
+
+    pool, ttl = asyncio.run(run())
+
+    assert [q.order for q in pool] == [1, 2, 3]
+    assert ttl > CACHE_TTLS["quiz_pool"]
@@ -0,0 +1,87 @@
+import asyncio
+import pytest
+from redis.exceptions import TimeoutError
+from app.services import cache, jobs, redis_client
+
+SOCKET_TIMEOUT = 0.2
+
+
+async def _read_command(reader: asyncio.StreamReader) -> list[bytes]:
+    count = int((await reader.readline())[1:])
+    parts = []
+    for _ in range(count):
+        size = int((await reader.readline())[1:])
+        parts.append((await reader.readexactly(size + 2))[:-2])
+    return parts
+
+
+async def _handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """Answer like a Redis server with nothing to deliver: blocking reads time out, channels stay quiet."""
+    try:
+        while True:
+            command = await _read_command(reader)
+            name = command[0].upper()
+            if name == b"XREADGROUP":
+                block_ms = int(command[command.index(b"BLOCK") + 1])
+                await asyncio.sleep(block_ms / 1000)
+                writer.write(b"*-1\r\n")
+            elif name == b"SUBSCRIBE":
+                channel = command[1]
+                writer.write(b"*3\r\n$9\r\nsubscribe\r\n$%d\r\n%s\r\n:1\r\n" % (len(channel), channel))
+            elif name == b"PING":
+                writer.write(b"+PONG\r\n")
+            else:
+                writer.write(b"+OK\r\n")
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+        writer.close()
+
+
+@pytest.fixture
+def quiet_redis(monkeypatch):
+    """Point REDIS_URL at a minimal server that holds blocking reads for their full BLOCK time."""
+    monkeypatch.setattr(redis_client, "REDIS_SOCKET_TIMEOUT", SOCKET_TIMEOUT)
+    redis_client.set_redis_client(None)
+    redis_client.set_blocking_redis_client(None)
+
+    async def serve(test):
+        server = await asyncio.start_server(_handle, "127.0.0.1", 0)
+        monkeypatch.setenv("REDIS_URL", f"redis://127.0.0.1:{server.sockets[0].getsockname()[1]}/0")
+        try:
+            return await test()
+        finally:
+            await redis_client.close_redis_client()
+            server.close()
+
+    return serve
+
+
+def test_blocking_read_longer_than_socket_timeout_is_not_an_error(quiet_redis, monkeypatch):
+    monkeypatch.setattr(jobs, "JOB_READ_BLOCK_MS", int(SOCKET_TIMEOUT * 1000 * 3))
+
+    async def test():
+        with pytest.raises(TimeoutError):
+            await redis_client.get_redis_client().xreadgroup(
+                jobs.JOBS_GROUP, "test", {jobs.JOBS_STREAM: ">"}, count=1, block=jobs.JOB_READ_BLOCK_MS
+            )
+        return await jobs._read_new_messages("test", 1)
+
+    assert asyncio.run(quiet_redis(test)) == []
+
+
+def test_quiet_invalidation_channel_keeps_the_l1_cache(quiet_redis, monkeypatch):
+    monkeypatch.setattr(cache, "L1_CACHE_ENABLED", True)
+    cache.local_cache.clear()
+
+    async def test():
+        cache.start_cache_invalidation_listener()
+        try:
+            await asyncio.sleep(SOCKET_TIMEOUT)
+            cache.local_cache.set("summary:abc:en", "cached", size=6)
+            await asyncio.sleep(SOCKET_TIMEOUT * 3)
+            return cache.local_cache.get("summary:abc:en")
+        finally:
+            await cache.stop_cache_invalidation_listener()
+
+    assert asyncio.run(quiet_redis(test)) == "cached"
+    cache.local_cache.clear()
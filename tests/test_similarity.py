@@ -0,0 +1,47 @@
+import asyncio
+from app.services import similarity
+from app.services.similarity import _bucket_keys, estimate_similarity, index_transcript, transcript_signature
+
+LESSON = " ".join(
+    f"In step {i} we take the derivative of the function and check the sign of the result." for i in range(60)
+)
+
+
+def test_identical_transcripts_have_identical_signatures():
+    assert transcript_signature(LESSON) == transcript_signature(LESSON.upper())
+
+
+def test_near_duplicates_score_above_unrelated_transcripts():
+    edited = LESSON.replace("step 7 ", "step seven ").replace("step 30 ", "stage 30 ")
+    unrelated = " ".join(f"Chapter {i} tells the story of a sailor crossing a stormy sea." for i in range(60))
+
+    signature = transcript_signature(LESSON)
+
+    assert estimate_similarity(signature, transcript_signature(edited)) >= similarity.SIMILARITY_THRESHOLD
+    assert estimate_similarity(signature, transcript_signature(unrelated)) < 0.1
+
+
+def test_empty_bands_are_not_bucketed():
+    first = _bucket_keys(transcript_signature("the cat sat on the red mat"), "en")
+    second = _bucket_keys(transcript_signature("a ship crossed the cold sea today"), "en")
+
+    assert len(first) <= 3
+    assert not set(first) & set(second)
+
+
+def test_index_finds_near_duplicate(redis_client):
+    async def run():
+        assert await index_transcript("original", "en", LESSON) is None
+        return await index_transcript("reupload", "en", LESSON + " Thanks for watching.")
+
+    assert asyncio.run(run()) == "original"
+
+
+def test_index_errors_do_not_fail_the_fetch(redis_client):
+    async def run():
+        await index_transcript("original", "en", LESSON)
+        await redis_client.set(similarity._signature_key("original", "en"), b"corrupt")
+        return await index_transcript("reupload", "en", LESSON)
+
+    assert asyncio.run(run()) is None
+    assert similarity.similarity_stats()["errors"] >= 1
@@ -0,0 +1,64 @@
+import asyncio
+import pytest
+from app.services import summary
+from app.services.cache import cache_get
+from app.services.cache_keys import summary_chunk_cache_key
+from app.utils.tokens import split_into_chunks
+
+
+def long_transcript(sentences: int) -> str:
+    return " ".join(f"Sentence number {i} explains one more idea." for i in range(sentences))
+
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    monkeypatch.setattr(summary, "SUMMARY_CHUNK_TOKENS", 60)
+    monkeypatch.setattr(summary, "SUMMARY_MAX_CONCURRENCY", 2)
+
+
+def test_short_transcript_is_summarized_in_one_call(openai_stub, small_chunks):
+    result = asyncio.run(summary.summarize_transcript("A short transcript.", "en"))
+
+    assert result == "summary of: A short transcript."
+    assert len(openai_stub.responses.calls) == 1
+    assert openai_stub.responses.calls[0]["input"] == "A short transcript."
+    assert "Create the summary in en" in openai_stub.responses.calls[0]["instructions"]
+
+
+def test_long_transcript_is_map_reduced(openai_stub, small_chunks):
+    transcript = long_transcript(40)
+    chunks = split_into_chunks(transcript, 60)
+
+    asyncio.run(summary.summarize_transcript(transcript, "en"))
+
+    calls = openai_stub.responses.calls
+    assert len(chunks) > 1
+    assert len(calls) == len(chunks) + 1
+    assert sorted(call["input"] for call in calls[:-1]) == sorted(chunks)
+    assert all(call["instructions"] == summary.SUMMARY_CHUNK_PROMPT for call in calls[:-1])
+    assert calls[-1]["input"] == "\n\n".join(f"summary of: {chunk[:20]}" for chunk in chunks)
+
+
+def test_chunk_summaries_are_cached_across_languages(openai_stub, small_chunks):
+    transcript = long_transcript(40)
+    chunks = split_into_chunks(transcript, 60)
+
+    async def run():
+        await summary.summarize_transcript(transcript, "en")
+        await summary.summarize_transcript(transcript, "es")
+        return await cache_get("summary_chunk", summary_chunk_cache_key(chunks[0], summary.SUMMARY_CHUNK_PROMPT))
+
+    cached = asyncio.run(run())
+
+    assert cached == f"summary of: {chunks[0][:20]}"
+    # The second language only makes the final call.
+    assert len(openai_stub.responses.calls) == len(chunks) + 2
+
+
+def test_chunk_calls_respect_the_concurrency_bound(openai_stub, small_chunks):
+    transcript = long_transcript(80)
+
+    asyncio.run(summary.reduce_transcript(transcript))
+
+    assert len(openai_stub.responses.calls) > summary.SUMMARY_MAX_CONCURRENCY
+    assert openai_stub.responses.max_active == summary.SUMMARY_MAX_CONCURRENCY
@@ -0,0 +1,28 @@
+import re
+from app.utils.tokens import count_tokens, split_into_chunks
+
+
+def test_short_text_is_one_chunk():
+    assert split_into_chunks("One sentence. Another one.", 100) == ["One sentence. Another one."]
+
+
+def test_chunks_break_on_sentence_boundaries():
+    sentences = [f"This is sentence {i}." for i in range(30)]
+
+    chunks = split_into_chunks(" ".join(sentences), 20)
+
+    assert len(chunks) > 1
+    # Chunks are budgeted by the tokens of their sentences, not of the joined text.
+    assert all(sum(count_tokens(s) for s in re.split(r"(?<=\.) ", chunk)) <= 20 for chunk in chunks)
+    assert " ".join(chunks) == " ".join(sentences)
+    assert all(chunk.endswith(".") for chunk in chunks)
+
+
+def test_sentence_longer_than_a_chunk_is_split_on_words():
+    text = " ".join(f"word{i}" for i in range(200))
+
+    chunks = split_into_chunks(text, 25)
+
+    assert len(chunks) > 1
+    assert all(count_tokens(chunk) <= 25 for chunk in chunks)
+    assert " ".join(chunks).split() == text.split()
@@ -0,0 +1,69 @@
+import pytest
+from app.services import transcript_preprocessing
+from app.services.transcript_preprocessing import fit_to_budget, preprocess_transcript
+from app.utils.tokens import count_tokens
+
+
+@pytest.fixture(autouse=True)
+def no_budget(monkeypatch):
+    monkeypatch.setattr(transcript_preprocessing, "TRANSCRIPT_MAX_TOKENS", 0)
+
+
+def test_removes_tags_and_html_entities():
+    text = preprocess_transcript("[Music] Welcome &amp; hello ♪♪ everyone [Applause]", "en")
+
+    assert text == "Welcome & hello everyone"
+
+
+def test_removes_english_fillers():
+    assert preprocess_transcript("So, um, the answer is, uh, forty two.", "en") == "So, the answer is, forty two."
+
+
+def test_keeps_the_sentence_end_after_a_filler():
+    text = preprocess_transcript("That is the whole proof, um. Next we add them, uh. Um. Done.", "en")
+
+    assert text == "That is the whole proof. Next we add them. Done."
+
+
+def test_keeps_words_that_are_fillers_in_other_languages():
+    assert preprocess_transcript("Este é um exemplo de um algoritmo", "pt") == "Este é um exemplo de um algoritmo"
+
+
+def test_collapses_repeated_phrases_of_several_words():
+    assert preprocess_transcript("and then we and then we add the two numbers", "en") == "and then we add the two numbers"
+
+
+def test_keeps_single_repeated_words():
+    assert preprocess_transcript("the sequence 1 1 2 3 shows that that is true", "en") == "the sequence 1 1 2 3 shows that that is true"
+
+
+def sentences(count: int) -> str:
+    return " ".join(f"Part {i} of the lesson covers one topic." for i in range(count))
+
+
+def test_fit_to_budget_keeps_short_texts():
+    text = sentences(3)
+
+    assert fit_to_budget(text, 1000) == text
+    assert fit_to_budget(text, 0) == text
+
+
+def test_fit_to_budget_truncate_keeps_the_beginning():
+    text = sentences(500)
+
+    fitted = fit_to_budget(text, 400, "truncate")
+
+    assert count_tokens(fitted) <= 400
+    assert fitted.startswith("Part 0 ")
+    assert "Part 499 " not in fitted
+
+
+def test_fit_to_budget_sample_spans_the_whole_text():
+    text = sentences(500)
+
+    fitted = fit_to_budget(text, 1000, "sample")
+
+    assert count_tokens(fitted) <= 1000
+    assert fitted.startswith("Part 0 ")
+    assert any(f"Part {i} " in fitted for i in range(100, 200))
+    assert any(f"Part {i} " in fitted for i in range(300, 500))
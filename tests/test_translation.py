@@ -0,0 +1,44 @@
+import asyncio
+import pytest
+from app.services.translation import _fan_out
+from app.utils.exceptions import APIException
+
+
+def fan_out(translate, languages=("en", "es", "fr")):
+    async def generate_source():
+        return "hello"
+
+    return asyncio.run(_fan_out(
+        "summary", list(languages), "en", lambda language: f"summary:test:{language}", generate_source, translate
+    ))
+
+
+def test_every_language_is_translated_from_one_source(redis_client):
+    async def translate(source, language):
+        return f"{source} in {language}"
+
+    results, errors = fan_out(translate)
+
+    assert results == {"en": "hello", "es": "hello in es", "fr": "hello in fr"}
+    assert errors == {}
+
+
+def test_failed_languages_are_reported_without_failing_the_rest(redis_client):
+    async def translate(source, language):
+        if language == "fr":
+            raise RuntimeError("upstream error")
+        return f"{source} in {language}"
+
+    results, errors = fan_out(translate)
+
+    assert results == {"en": "hello", "es": "hello in es"}
+    assert list(errors) == ["fr"]
+    assert errors["fr"].status_code == 500
+
+
+def test_raises_when_every_language_fails(redis_client):
+    async def translate(source, language):
+        raise RuntimeError("upstream error")
+
+    with pytest.raises(APIException):
+        fan_out(translate, languages=("es", "fr"))
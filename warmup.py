@@ -0,0 +1,86 @@
+import argparse
+import asyncio
+from pathlib import Path
+from dotenv import load_dotenv
+
+
+def main() -> None:
+    """Warm the catalog given on the command line."""
+    # The app modules read their settings on import, so they are imported only once .env is loaded.
+    from app.core.logging import setup_logging, info
+    from app.services.cache import start_cache_invalidation_listener, stop_cache_invalidation_listener
+    from app.services.http_client import close_http_clients
+    from app.services.openai import close_openai_client
+    from app.services.redis_client import close_redis_client
+    from app.services.warmup import (
+        read_catalog,
+        run_warmup,
+        WARMUP_CONCURRENCY,
+        WARMUP_RATE_PER_MINUTE,
+        WARMUP_CACHE_TTL,
+    )
+
+    async def run(args: argparse.Namespace) -> None:
+        start_cache_invalidation_listener()
+        try:
+            entries = read_catalog(args.catalog, args.language)
+            totals = await run_warmup(
+                entries,
+                args.state or args.catalog.with_name(args.catalog.name + ".warmup-state"),
+                mode=args.mode,
+                num_questions=args.num_questions,
+                concurrency=args.concurrency,
+                rate_per_minute=args.rate,
+                ttl=args.ttl,
+            )
+            info(
+                "Warm-up finished: %s generated, %s already cached, %s failed, %s done in a previous run.",
+                totals["generated"], totals["cached"], totals["failed"], totals["resumed"]
+            )
+        finally:
+            await stop_cache_invalidation_listener()
+            await close_http_clients()
+            await close_openai_client()
+            await close_redis_client()
+
+    parser = argparse.ArgumentParser(description="Prefetch transcripts, summaries and quizzes for a catalog of videos.")
+    parser.add_argument("catalog", type=Path, help="File with one '<youtube_url> [language]' entry per line")
+    parser.add_argument("--language", default="en", help="Language for entries that do not set one (default: en)")
+    parser.add_argument("--mode", choices=("summary", "quiz", "both"), default="both")
+    parser.add_argument("--num-questions", type=int, default=5)
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=WARMUP_CONCURRENCY,
+        help="Entries warmed at the same time (default: WARMUP_CONCURRENCY)",
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=WARMUP_RATE_PER_MINUTE,
+        help="Maximum entries started per minute, 0 for no limit (default: WARMUP_RATE_PER_MINUTE)",
+    )
+    parser.add_argument(
+        "--ttl",
+        type=int,
+        default=WARMUP_CACHE_TTL,
+        help="Seconds warmed entries are kept in Redis (default: WARMUP_CACHE_TTL)",
+    )
+    parser.add_argument(
+        "--state",
+        type=Path,
+        help="Progress file used to resume an interrupted run (default: <catalog>.warmup-state)",
+    )
+    args = parser.parse_args()
+    setup_logging()
+    info("Logging initialized successfully.")
+    try:
+        asyncio.run(run(args))
+    except KeyboardInterrupt:
+        info("Warm-up interrupted, run it again to resume.")
+
+
+if __name__ == "__main__":
+    # Like uvicorn's env_file in main.py: variables already set in the environment win.
+    load_dotenv()
+    main()
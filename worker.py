@@ -0,0 +1,45 @@
+import argparse
+import asyncio
+from dotenv import load_dotenv
+
+
+def main() -> None:
+    """Run the job worker until interrupted."""
+    # The app modules read their settings on import, so they are imported only once .env is loaded.
+    from app.core.logging import setup_logging, info
+    from app.services.cache import start_cache_invalidation_listener, stop_cache_invalidation_listener
+    from app.services.http_client import close_http_clients
+    from app.services.openai import close_openai_client
+    from app.services.redis_client import close_redis_client
+    from app.services.jobs import run_worker, JOB_WORKER_CONCURRENCY
+
+    async def run(concurrency: int) -> None:
+        start_cache_invalidation_listener()
+        try:
+            await run_worker(concurrency)
+        finally:
+            await stop_cache_invalidation_listener()
+            await close_http_clients()
+            await close_openai_client()
+            await close_redis_client()
+
+    parser = argparse.ArgumentParser(description="Run a summary/quiz generation job worker.")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=JOB_WORKER_CONCURRENCY,
+        help="Number of jobs processed at the same time (default: JOB_WORKER_CONCURRENCY)",
+    )
+    args = parser.parse_args()
+    setup_logging()
+    info("Logging initialized successfully.")
+    try:
+        asyncio.run(run(args.concurrency))
+    except KeyboardInterrupt:
+        info("Job worker stopped.")
+
+
+if __name__ == "__main__":
+    # Like uvicorn's env_file in main.py: variables already set in the environment win.
+    load_dotenv()
+    main()